@@ -102,6 +102,8 @@ echo -e "${BLUE}[5/7]${NC} Downloading application files..."
 
 # Download main Python file
 curl -fsSL "https://raw.githubusercontent.com/Victorpay1/voice-to-text/main/voice_to_text_menubar_enhanced.py" -o voice_to_text_menubar_enhanced.py
+# Model loading and decoding (also what the optional inference worker runs)
+curl -fsSL "https://raw.githubusercontent.com/Victorpay1/voice-to-text/main/voice_to_text_inference.py" -o voice_to_text_inference.py
 
 # If GitHub isn't set up yet, copy from local (for testing)
 if [ ! -f "voice_to_text_menubar_enhanced.py" ]; then
@@ -109,6 +111,7 @@ if [ ! -f "voice_to_text_menubar_enhanced.py" ]; then
     # This section is temporary - will be replaced with GitHub download
     if [ -f "/Users/victorpaytuvi/Desktop/CLAUDE-PROJECTS/voice to text/voice_to_text_menubar_enhanced.py" ]; then
         cp "/Users/victorpaytuvi/Desktop/CLAUDE-PROJECTS/voice to text/voice_to_text_menubar_enhanced.py" .
+        cp "/Users/victorpaytuvi/Desktop/CLAUDE-PROJECTS/voice to text/voice_to_text_inference.py" .
     else
         echo -e "${RED}Error: Could not download or find application files.${NC}"
         exit 1
@@ -131,7 +134,7 @@ echo "  Installing core packages..."
 pip install --quiet rumps faster-whisper sounddevice numpy pynput torch psutil scipy language-tool-python certifi
 
 echo "  Installing voice detection..."
-pip install --quiet silero-vad torchaudio
+pip install --quiet silero-vad torchaudio onnxruntime
 
 echo "  Installing translation support..."
 pip install --quiet argostranslate
@@ -0,0 +1,335 @@
+"""
+Whisper model loading, pooling and decoding for Voice to Text.
+
+Kept free of GUI and audio imports (rumps, pynput, sounddevice) so the
+optional inference worker process starts by importing only this module:
+    python voice_to_text_inference.py <pipe fd> <memory budget MB>
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import psutil
+from faster_whisper import WhisperModel
+
+def resolve_compute_type(compute_type, device="cpu"):
+    """The compute type CTranslate2 will really use on this device
+
+    Unsupported types are converted at load time anyway (int8_float16 runs as
+    int8 on most CPUs); resolving them first keeps equivalent configurations
+    on one model pool key instead of loading the same weights twice.
+    """
+    try:
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types(device)
+    except Exception:
+        return compute_type
+    if compute_type in supported:
+        return compute_type
+    if compute_type.startswith('int8') and 'int8' in supported:
+        return 'int8'
+    return 'float32' if 'float32' in supported else compute_type
+
+def warmup_whisper_model(model, sample_rate=16000):
+    """Warm up model with synthetic audio to eliminate cold-start penalty"""
+    try:
+        print("   🔥 Warming up model (eliminating cold-start)...")
+
+        # Create 3 seconds of minimal audio (near-silence with tiny variations)
+        # This is enough to initialize all internal caches
+        warmup_duration = 3  # seconds
+        warmup_samples = sample_rate * warmup_duration
+
+        # Generate minimal audio (very quiet tone to simulate speech)
+        # Using a simple sine wave at speech frequency (200 Hz)
+        t = np.linspace(0, warmup_duration, warmup_samples, dtype=np.float32)
+        warmup_audio = 0.01 * np.sin(2 * np.pi * 200 * t)  # Very quiet 200 Hz tone
+
+        # Run a quick transcription to warm up all caches
+        # Use minimal settings for speed (audio goes in as an array - no WAV round-trip)
+        segments, _ = model.transcribe(
+            warmup_audio,
+            language='en',
+            beam_size=1,  # Fastest
+            temperature=0.0,
+            vad_filter=False
+        )
+        # transcribe() is lazy - decode one segment so the caches are really warm
+        next(iter(segments), None)
+
+        print("   ✅ Model warmed up! First recording will be fast.")
+
+    except Exception as e:
+        print(f"   ⚠️  Warmup failed (non-critical): {e}")
+        # Non-critical - continue without warmup
+        pass
+
+def load_whisper_model(key):
+    """Load and warm up one Whisper model (the model pool's loader)"""
+    source, compute_type, (threads, workers) = key
+    model = WhisperModel(
+        source,  # Model name, Hub repo or local directory
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=threads,
+        num_workers=workers
+    )
+    print(f"   Using {threads} CPU threads, {workers} worker(s) ({compute_type})")
+
+    # Warm up the model to eliminate cold-start penalty
+    warmup_whisper_model(model)
+    return model
+
+def prompt_tokens(model, prompt, budget):
+    """Token ids of prompt for model's tokenizer, at most budget tokens (None: all), cached on the model
+
+    Whole sentences are dropped from the start until the prompt fits (the
+    vocabulary sentence is last and kept); a single sentence over budget
+    keeps its first tokens. Whisper's byte-level BPE splits before spaces,
+    so encoding sentence by sentence gives the same ids as the whole text.
+    """
+    cache = getattr(model, 'prompt_token_cache', None)
+    if cache is None:
+        cache = model.prompt_token_cache = {}
+    if (prompt, budget) not in cache:
+        sentences = [s for s in re.split(r'(?<=[.!?])\s+', prompt.strip()) if s]
+        encoded = [model.hf_tokenizer.encode(" " + s, add_special_tokens=False).ids for s in sentences]
+        while budget and len(encoded) > 1 and sum(len(ids) for ids in encoded) > budget:
+            encoded.pop(0)
+        cache[(prompt, budget)] = [token for ids in encoded for token in ids][:budget]
+    return cache[(prompt, budget)]
+
+def whisper_segments(model, audio, options):
+    """Transcribe with model, through the batched pipeline when options has a batch_size
+
+    The batched pipeline encodes and decodes up to batch_size independent
+    chunks (clip_timestamps as {'start', 'end'} seconds) at once instead of
+    one 30s window after the other. Segments come back in chunk order.
+    A prompt_token_budget option trims initial_prompt with prompt_tokens;
+    without one the prompt is only tokenized (once per model) and kept whole.
+    """
+    options = dict(options)
+    batch_size = options.pop('batch_size', None)
+    budget = options.pop('prompt_token_budget', None) or None
+    if options.get('initial_prompt'):
+        tokens = prompt_tokens(model, options['initial_prompt'], budget)
+        if not batch_size:
+            options['initial_prompt'] = tokens
+        elif budget:
+            # The batched pipeline only takes prompt text: hand it the trimmed text instead
+            options['initial_prompt'] = model.hf_tokenizer.decode(tokens)
+    if batch_size:
+        from faster_whisper import BatchedInferencePipeline
+        segments, _ = BatchedInferencePipeline(model=model).transcribe(audio, batch_size=batch_size, **options)
+    else:
+        segments, _ = model.transcribe(audio, **options)
+    return segments
+
+class ModelPool:
+    """Loaded Whisper models keyed by (model source, compute type, (CPU threads, workers)).
+
+    Every model's footprint is the RSS it added when it was loaded - measured,
+    not estimated. Before a load that would go over the memory budget the
+    least recently used models are evicted. Models can also be parked: their
+    CTranslate2 weights are unloaded (the proper way to give its caching
+    allocator's memory back, Issue #660) but the object stays, so the next
+    use only reloads weights from disk.
+    """
+
+    def __init__(self, loader, budget_mb=2000):
+        self.loader = loader  # key -> loaded model
+        self.budget_mb = budget_mb
+        self._models = OrderedDict()  # key -> model, least recently used first
+        self.sizes_mb = {}  # key -> measured RSS growth of its last load (kept after eviction)
+        self.load_times = {}  # key -> seconds of its last load
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reloads = 0  # Parked models brought back
+        self.reload_seconds = 0.0
+        self._lock = threading.RLock()
+        self._process = psutil.Process(os.getpid())
+
+    def _rss_mb(self):
+        return self._process.memory_info().rss / 1024 / 1024
+
+    @staticmethod
+    def is_loaded(model):
+        """True while the model's weights are in memory (not parked)"""
+        return model.model.model_is_loaded
+
+    def resident_mb(self, exclude=None):
+        """Measured memory of the models whose weights are loaded"""
+        return sum(self.sizes_mb.get(key, 0) for key, model in self._models.items()
+                   if key != exclude and self.is_loaded(model))
+
+    def __len__(self):
+        return len(self._models)
+
+    def is_resident(self, key):
+        """Whether key's weights are loaded - without the pool lock, which a load holds"""
+        model = self._models.get(key)
+        return model is not None and self.is_loaded(model)
+
+    def peek(self, key):
+        """The pooled model for key (possibly parked) without touching the statistics"""
+        return self._models.get(key)
+
+    def acquire(self, key):
+        """Return a ready model for key, loading (and evicting) if needed"""
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                if self.is_loaded(model):
+                    self.hits += 1
+                    return model
+                # Parked: bring the weights back (fast, from the local cache)
+                self.misses += 1
+                self._make_room(key)
+                start = time.time()
+                model.model.load_model()
+                self.reloads += 1
+                self.reload_seconds += time.time() - start
+                return model
+
+            self.misses += 1
+            self._make_room(key)
+            start, before = time.time(), self._rss_mb()
+            model = self.loader(key)
+            self._models[key] = model
+            self._record_load(key, start, before)
+            # The first load had no measurement yet: evict others if it went over budget
+            self._make_room(key)
+            return model
+
+    def _record_load(self, key, start, before):
+        self.load_times[key] = time.time() - start
+        self.sizes_mb[key] = max(0.0, self._rss_mb() - before)
+
+    def _make_room(self, key):
+        """Evict least recently used models until key fits in the budget"""
+        needed_mb = self.sizes_mb.get(key, 0)  # Measured when it was last loaded
+        for other in list(self._models):
+            if self.resident_mb(exclude=key) + needed_mb <= self.budget_mb:
+                break
+            if other != key:
+                print(f"   🧹 Model budget {self.budget_mb}MB: evicting {self.describe(other)}")
+                self.evict(other)
+
+    def park(self, key):
+        """Unload a model's weights but keep it pooled; returns True if it was loaded"""
+        with self._lock:
+            model = self._models.get(key)
+            if model is None or not self.is_loaded(model):
+                return False
+            model.model.unload_model()
+            return True
+
+    def park_all(self):
+        """Park every loaded model; returns how many were loaded"""
+        parked = 0
+        with self._lock:
+            for key in list(self._models):
+                try:
+                    parked += self.park(key)
+                except Exception:
+                    pass  # Ignore errors during cleanup
+        return parked
+
+    def evict(self, key):
+        with self._lock:
+            if self._models.pop(key, None) is not None:
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every model (idle timeout, shutdown)"""
+        with self._lock:
+            count = len(self._models)
+            self._models.clear()
+        self.release_memory()
+        return count
+
+    @staticmethod
+    def release_memory():
+        """Collect garbage and hand freed heap pages back to the OS"""
+        import gc
+        import ctypes
+        import ctypes.util
+        gc.collect()
+        try:
+            if sys.platform == 'darwin':
+                # macOS has no malloc_trim; this asks every malloc zone to return free pages
+                libc = ctypes.CDLL(ctypes.util.find_library('c'))
+                libc.malloc_zone_pressure_relief.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+                libc.malloc_zone_pressure_relief.restype = ctypes.c_size_t
+                libc.malloc_zone_pressure_relief(None, 0)
+            elif sys.platform.startswith('linux'):
+                ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass  # Unable to trim - the collection above still ran
+
+    @staticmethod
+    def describe(key):
+        source, compute_type, (threads, workers) = key
+        return f"{os.path.basename(source.rstrip(os.sep)) or source}/{compute_type}/{threads}x{workers} threads"
+
+    def summary(self):
+        """Hit/miss counts and measured sizes and load times, for the log"""
+        with self._lock:
+            loaded = ", ".join(
+                f"{self.describe(key)} {self.sizes_mb.get(key, 0):.0f}MB in {self.load_times.get(key, 0):.1f}s"
+                + ("" if self.is_loaded(model) else " (parked)")
+                for key, model in self._models.items())
+        return (f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+                f"{self.reloads} reloads ({self.reload_seconds:.1f}s), "
+                f"{self.resident_mb():.0f}/{self.budget_mb}MB - {loaded or 'empty'}")
+
+def inference_worker_main(conn, budget_mb):
+    """Inference subprocess: serve load/transcribe requests from the app over conn"""
+    pool = ModelPool(load_whisper_model, budget_mb=budget_mb)
+    process = psutil.Process(os.getpid())
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break  # The app went away
+        command = message[0]
+        if command == 'stop':
+            break
+        if command == 'cancel':
+            continue  # Arrived after its transcription had already finished
+        try:
+            if command == 'load':
+                key = message[1]
+                pool.acquire(key)
+                conn.send(('loaded', pool.sizes_mb[key], pool.load_times[key]))
+            elif command == 'transcribe':
+                _, key, options = message
+                # Raw float32 PCM follows the request - no pickling of the array
+                audio = np.frombuffer(conn.recv_bytes(), dtype=np.float32)
+                segments = whisper_segments(pool.acquire(key), audio, options)
+                for segment in segments:
+                    if conn.poll() and conn.recv()[0] == 'cancel':
+                        break  # The app no longer wants this result - stop decoding
+                    conn.send(('segment', {
+                        'start': segment.start,
+                        'end': segment.end,
+                        'text': segment.text,
+                        'avg_logprob': segment.avg_logprob,
+                        'no_speech_prob': segment.no_speech_prob,
+                        'compression_ratio': segment.compression_ratio,
+                    }))
+                conn.send(('done', process.memory_info().rss / 1024 / 1024))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+if __name__ == "__main__":
+    # Started by InferenceWorker with one end of its pipe inherited as a file descriptor
+    from multiprocessing.connection import Connection
+    inference_worker_main(Connection(int(sys.argv[1])), float(sys.argv[2]))
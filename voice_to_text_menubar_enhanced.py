@@ -15,28 +15,91 @@ Key Improvements:
 import ssl
 import certifi
 import os
+import json
 
 # Fix SSL certificate issues for model download
 ssl._create_default_https_context = ssl._create_unverified_context
 os.environ['SSL_CERT_FILE'] = certifi.where()
 
+CONFIG_FILE = os.path.expanduser("~/.voice_to_text_config.json")
+
+class ThreadBudget:
+    """One CPU thread budget shared by every thread pool in the process.
+
+    Whisper (CTranslate2) gets the budget minus a core for VAD and audio,
+    translation (argostranslate's own CTranslate2) half of it - its models are
+    small and don't scale further - and VAD and BLAS one thread each. Stages
+    that run back to back then never oversubscribe the cores.
+    """
+
+    BLAS_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                      'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+    def __init__(self, total=None, legacy=False):
+        self.total = max(1, int(total or os.cpu_count() or 1))
+        self.legacy = legacy  # Every library picks its own pool size (benchmark baseline)
+        self.vad = 1
+        self.blas = 1
+        self.whisper = self.total - 1 if self.total > 2 else self.total
+        self.translation = max(1, min(4, self.total // 2))
+        if legacy:
+            self.whisper = os.cpu_count() or 1
+
+    @classmethod
+    def configured(cls):
+        """The budget from VOICE_TO_TEXT_THREAD_BUDGET or the config's thread_budget"""
+        budget = os.environ.get('VOICE_TO_TEXT_THREAD_BUDGET')
+        if budget == 'legacy':
+            return cls(legacy=True)
+        if not budget:
+            try:
+                with open(CONFIG_FILE, 'r') as f:
+                    budget = json.load(f).get('thread_budget')
+            except Exception:
+                budget = None
+        try:
+            return cls(budget)
+        except (ValueError, TypeError):
+            # A typo here must not stop the app from launching
+            print(f"⚠️  Invalid thread budget {budget!r} - using all cores")
+            return cls()
+
+    def apply_environment(self):
+        """Size the pools that read env vars: BLAS (at NumPy import) and argostranslate"""
+        if self.legacy:
+            return
+        for variable in self.BLAS_VARIABLES:
+            os.environ.setdefault(variable, str(self.blas))
+        os.environ.setdefault('ARGOS_INTER_THREADS', '1')
+        os.environ.setdefault('ARGOS_INTRA_THREADS', str(self.translation))
+
+    def __str__(self):
+        if self.legacy:
+            return "legacy (each library sizes its own pool)"
+        return (f"{self.total} threads: Whisper {self.whisper}, translation {self.translation}, "
+                f"VAD {self.vad}, BLAS {self.blas}")
+
+# Before NumPy is imported: BLAS sizes its thread pool at import time
+THREAD_BUDGET = ThreadBudget.configured()
+THREAD_BUDGET.apply_environment()
+
 import rumps
-from faster_whisper import WhisperModel
+# Model loading and decoding live in their own module so the inference worker can import them without the GUI
+from voice_to_text_inference import (ModelPool, load_whisper_model, prompt_tokens,
+                                     resolve_compute_type, whisper_segments)
 import sounddevice as sd
 import numpy as np
-from pynput import keyboard
-from pynput.keyboard import Controller
+from pynput import keyboard, mouse
+from pynput.keyboard import Controller, Key
 import threading
-import tempfile
-import wave
 import time
 import re
-import torch
-import json
 import signal
 import atexit
 import sys
 import psutil  # For memory monitoring
+from collections import deque
+from types import SimpleNamespace
 
 # Safety: Prevent multiple instances from running
 PID_FILE = os.path.expanduser("~/.voice_to_text.pid")
@@ -93,6 +156,1203 @@ def monitor_memory():
         print(f"⚠️  Memory monitoring error: {e}")
         return False
 
+# Longest dictation we accept before auto-stopping (seconds)
+MAX_RECORDING_SECONDS = 300
+
+# Whisper model variants an accuracy mode can use. 'source' is a faster-whisper
+# model name, a Hub repo with a CTranslate2 conversion, or a local directory.
+MODEL_VARIANTS = {
+    'small': {'source': 'small', 'download_mb': 484, 'languages': None},
+    'medium': {'source': 'medium', 'download_mb': 1530, 'languages': None},
+    'large-v3-turbo': {'source': 'large-v3-turbo', 'download_mb': 1620, 'languages': None},
+    'distil-small.en': {'source': 'distil-small.en', 'download_mb': 333, 'languages': ['en']},
+    'distil-large-v3': {'source': 'distil-large-v3', 'download_mb': 1510, 'languages': ['en']},
+}
+
+# Transcription settings per accuracy mode (the loaded Whisper model is attached at runtime).
+# cpu_threads None means every core; the config's "accuracy_modes" can override any of these.
+ACCURACY_MODES = {
+    'fast': {
+        'model_name': 'small',
+        'compute_type': 'int8',
+        'cpu_threads': None,
+        'num_workers': 1,
+        'beam_size': 3,
+        'temperature': 0.0,
+        'vad_threshold': 0.5,
+        'compression_ratio': 4,  # Less aggressive compression for speed
+        'description': 'Fast mode'
+    },
+    'clarity': {
+        'model_name': 'small',
+        'compute_type': 'int8_float16',
+        'cpu_threads': None,
+        'num_workers': 1,
+        'beam_size': 5,
+        'temperature': 0.2,
+        'vad_threshold': 0.35,  # More sensitive to catch all speech (research-optimized)
+        'compression_ratio': 6,  # More aggressive compression for clarity
+        'description': 'Clarity Boost'
+    },
+    'max': {
+        'model_name': 'medium',
+        'compute_type': 'int8_float16',
+        'cpu_threads': None,
+        'num_workers': 1,
+        'beam_size': 5,
+        'temperature': 0.2,
+        'vad_threshold': 0.4,
+        'compression_ratio': 6,
+        'description': 'Max Accuracy'
+    }
+}
+
+# Initial prompt templates: language -> accuracy mode (or 'default') -> text.
+# Change a template under a new version suffix so benchmark results stay comparable.
+# Research shows detailed prompts improve accuracy for both languages, but every
+# prompt token is decoder context the first window pays for
+PROMPT_TEMPLATES = {
+    'detailed-v1': {
+        'en': {
+            'default': (
+                "This is a voice dictation for professional or personal use. "
+                "The speaker may include unclear speech, mumbling, partial words, or corrections. "
+                "Use contextual clues to infer intended words. Accurately transcribe: "
+                "technical terminology, software names, programming concepts, casual conversational phrases, "
+                "proper nouns, brand names, acronyms, and natural speech patterns. "
+                "Preserve the speaker's intended meaning even with imperfect pronunciation."
+            ),
+            'fast': (
+                "This is a voice dictation for technical work, chat messages, emails, or AI prompts. "
+                "Accurately transcribe: technical terms, software names, programming concepts, "
+                "casual language, proper nouns, brand names, and acronyms. "
+                "Maintain natural conversational tone."
+            ),
+        },
+        'es': {
+            'default': (
+                "Este es un dictado de voz para uso profesional o personal en español latinoamericano. "
+                "El hablante puede incluir habla poco clara, murmullos, palabras parciales o correcciones. "
+                "Usa claves del contexto para inferir las palabras pretendidas. Transcribe con precisión: "
+                "terminología técnica, nombres de software, conceptos de programación, frases conversacionales casuales, "
+                "nombres propios, nombres de marcas, acrónimos y patrones naturales del habla. "
+                "Preserva el significado pretendido del hablante incluso con pronunciación imperfecta. "
+                "Incluye variaciones dialectales de América Latina."
+            ),
+            'fast': (
+                "Este es un dictado de voz para trabajo técnico, mensajes de chat, emails o prompts de IA en español. "
+                "Transcribe con precisión: términos técnicos, nombres de software, conceptos de programación, "
+                "lenguaje casual, nombres propios, nombres de marcas y acrónimos. "
+                "Mantén el tono conversacional natural. Incluye variaciones dialectales de América Latina."
+            ),
+        },
+    },
+    'short-v1': {
+        'en': {'default': "Voice dictation of chat messages, emails and technical notes, with software names and acronyms."},
+        'es': {'default': "Dictado de voz de mensajes, emails y notas técnicas, con nombres de software y acrónimos."},
+    },
+    'none-v1': {
+        'en': {'default': ""},
+        'es': {'default': ""},
+    },
+}
+
+class AudioCaptureBuffer:
+    """Preallocated capture buffer written directly from the PortAudio callback.
+
+    Audio lands in one contiguous NumPy array (int16 by default - half the
+    memory of float32) that grows in large blocks, so the realtime thread
+    never allocates per callback. The rest of the pipeline reads zero-copy
+    views of what has been written so far.
+    """
+
+    def __init__(self, sample_rate, dtype=np.int16, initial_seconds=60,
+                 block_seconds=30, max_seconds=MAX_RECORDING_SECONDS + 10, data=None):
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype if data is None else data.dtype)
+        self.initial_frames = int(initial_seconds * sample_rate)
+        self.block_frames = int(block_seconds * sample_rate)
+        self.max_frames = int(max_seconds * sample_rate)
+        # np.zeros is calloc-backed: pages are only committed once written
+        self._data = np.zeros(self.initial_frames, dtype=self.dtype) if data is None else data
+        self._lock = threading.Lock()
+        # Frames written so far (readers may view [0, frames)); wrapping `data`
+        # presents finished audio to the streaming consumers without a copy
+        self.frames = 0 if data is None else len(data)
+        self.callbacks = 0
+        self.overruns = 0  # PortAudio input overflows reported to the callback
+        self.dropped_frames = 0  # Frames discarded because the buffer was full
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    @property
+    def seconds(self):
+        return self.frames / self.sample_rate
+
+    def _grow(self, needed):
+        """Grow by at least one block (called from the audio thread, rarely)"""
+        new_size = min(self.max_frames, max(needed, self.capacity + self.block_frames))
+        grown = np.empty(new_size, dtype=self.dtype)
+        grown[:self.frames] = self._data[:self.frames]
+        with self._lock:
+            self._data = grown
+
+    def write(self, indata, status=None):
+        """Append one callback's worth of audio (realtime-safe, no per-call allocation)"""
+        self.callbacks += 1
+        if status and status.input_overflow:
+            self.overruns += 1
+        self.append(indata)
+
+    def append(self, indata):
+        """Append audio that did not come from a callback (e.g. the pre-roll)"""
+        samples = indata[:, 0] if indata.ndim > 1 else indata
+        start = self.frames
+        end = start + len(samples)
+
+        if end > self.capacity and self.capacity < self.max_frames:
+            self._grow(end)
+
+        if end > self.capacity:
+            # Buffer is at its hard cap - keep what fits, count the rest
+            self.dropped_frames += end - self.capacity
+            end = self.capacity
+            samples = samples[:end - start]
+            if end <= start:
+                return
+
+        target = self._data[start:end]
+        if samples.dtype == self.dtype:
+            target[:] = samples
+        elif self.dtype.kind == 'i':
+            # Float stream into int16 storage: scale straight into the slot
+            np.multiply(samples, 32767, out=target, casting='unsafe')
+        else:
+            np.multiply(samples, 1.0 / 32768, out=target, casting='unsafe')
+
+        self.frames = end
+
+    def view(self, start=0, end=None):
+        """Zero-copy view of the captured samples in storage dtype"""
+        # Read the frame count BEFORE the array: a concurrent grow swaps the
+        # array first, so both old and new arrays are valid up to this count
+        end = self.frames if end is None else min(end, self.frames)
+        with self._lock:
+            data = self._data
+        return data[start:end]
+
+    def to_float32(self, start=0, end=None):
+        """Captured audio as a new float32 array in [-1, 1] (the single working copy)"""
+        samples = self.view(start, end)
+        if self.dtype == np.float32:
+            return samples.copy()
+        audio = np.empty(len(samples), dtype=np.float32)
+        np.multiply(samples, 1.0 / 32768, out=audio)
+        return audio
+
+    def reset(self):
+        """Forget captured audio and give back anything grown past the initial block"""
+        with self._lock:
+            if self.capacity > self.initial_frames:
+                self._data = np.zeros(self.initial_frames, dtype=self.dtype)
+        self.frames = 0
+        self.callbacks = 0
+        self.overruns = 0
+        self.dropped_frames = 0
+
+class PreRollBuffer:
+    """Circular buffer holding the last few hundred milliseconds heard while idle.
+
+    With a warm input stream the callback keeps writing here between
+    recordings, so the first syllable spoken together with the hotkey is not
+    lost. On start the contents are moved, oldest first, into the capture
+    buffer.
+    """
+
+    def __init__(self, sample_rate, milliseconds=300, dtype=np.int16):
+        self.size = max(1, int(sample_rate * milliseconds / 1000))
+        self._data = np.zeros(self.size, dtype=dtype)
+        self._pos = 0  # Next write position
+        self._filled = 0
+
+    def write(self, indata):
+        samples = indata[:, 0] if indata.ndim > 1 else indata
+        n = len(samples)
+        if n >= self.size:
+            self._data[:] = samples[-self.size:]
+            self._pos = 0
+            self._filled = self.size
+            return
+        first = min(n, self.size - self._pos)
+        self._data[self._pos:self._pos + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        self._pos = (self._pos + n) % self.size
+        self._filled = min(self.size, self._filled + n)
+
+    def drain_into(self, audio_buffer):
+        """Append the held audio (oldest first) to a capture buffer and empty the ring"""
+        if self._filled < self.size:
+            audio_buffer.append(self._data[:self._filled])
+        else:
+            audio_buffer.append(self._data[self._pos:])
+            audio_buffer.append(self._data[:self._pos])
+        self.clear()
+
+    def clear(self):
+        """Forget the held audio (e.g. when the stream that filled it is closed)"""
+        self._pos = 0
+        self._filled = 0
+
+def find_silero_onnx_model():
+    """Path of the ONNX model shipped with silero-vad, found without importing the package
+
+    Importing silero_vad pulls in torch (hundreds of MB of RSS), so only its
+    install location is looked up.
+    """
+    import importlib.util
+    spec = importlib.util.find_spec('silero_vad')
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    for location in spec.submodule_search_locations:
+        path = os.path.join(location, 'data', 'silero_vad.onnx')
+        if os.path.exists(path):
+            return path
+    return None
+
+class SileroOnnxVAD:
+    """Silero VAD run directly through onnxruntime on NumPy windows - no torch.
+
+    Mirrors silero_vad's OnnxWrapper at 16 kHz: every 512-sample window is
+    prefixed with the last 64 samples of the previous one, and the recurrent
+    state is carried from call to call.
+    """
+
+    CONTEXT = 64  # Samples of the previous window the model sees at 16 kHz
+
+    def __init__(self, model_path, sample_rate=16000, threads=1):
+        import onnxruntime
+        options = onnxruntime.SessionOptions()
+        options.inter_op_num_threads = 1
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            model_path, providers=['CPUExecutionProvider'], sess_options=options)
+        inputs = sorted(i.name for i in self.session.get_inputs())
+        if inputs != ['input', 'sr', 'state']:
+            raise ValueError(f"unsupported Silero ONNX model inputs {inputs} (need silero-vad v5+)")
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self.reset_states()
+
+    def reset_states(self):
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._input = np.zeros((1, self.CONTEXT + StreamingVAD.WINDOW), dtype=np.float32)
+
+    def __call__(self, window):
+        """Speech probability of one 512-sample float32 window"""
+        self._input[0, self.CONTEXT:] = window
+        out, self._state = self.session.run(
+            None, {'input': self._input, 'state': self._state, 'sr': self._sr})
+        # This window's tail becomes the next window's context
+        self._input[0, :self.CONTEXT] = self._input[0, -self.CONTEXT:]
+        return float(out[0, 0])
+
+class TorchSileroVAD:
+    """Fallback through the silero_vad package (imports torch) when onnxruntime can't be used"""
+
+    def __init__(self, sample_rate=16000, threads=1):
+        import silero_vad
+        import torch
+        torch.set_num_threads(threads)  # Otherwise torch claims every core for its intra-op pool
+        self.torch = torch
+        self.sample_rate = sample_rate
+        # Use ONNX mode for better compatibility (returns just the model)
+        self.model = silero_vad.load_silero_vad(onnx=True)
+
+    def reset_states(self):
+        self.model.reset_states()
+
+    def __call__(self, window):
+        return self.model(self.torch.from_numpy(window), self.sample_rate).item()
+
+class EnergyGate:
+    """First-tier VAD: frame energy against the microphone's noise floor, vectorized over many windows.
+
+    Two kinds of windows are rejected before Silero sees them: digital
+    silence (peak below silence_db - a muted or disconnected microphone) and
+    windows within margin_db of the tracked noise floor, i.e. the room's own
+    hiss. The floor follows the quietest windows (minimum statistics, rising
+    by at most rise_db_per_s) and only gates once it is below max_floor_db,
+    so speech from the first window on never becomes "the floor", and soft
+    speech a few dB above a quiet room still reaches the model.
+    """
+
+    WINDOW_SECONDS = 512 / 16000  # One Silero window
+
+    def __init__(self, silence_db=-80.0, margin_db=3.0, max_floor_db=-50.0, rise_db_per_s=0.5):
+        self.silence_peak = 10 ** (silence_db / 20)  # dBFS -> linear peak, so no log per frame
+        self.silence_db = silence_db
+        self.margin_db = margin_db
+        self.max_floor_db = max_floor_db
+        self.rise_db = rise_db_per_s * self.WINDOW_SECONDS  # Per window
+        self.floor_db = None  # Noise floor of the current recording (None until the first window)
+
+    def reset(self):
+        """Forget the noise floor before a new recording"""
+        self.floor_db = None
+
+    def candidates(self, frames):
+        """Boolean mask over the rows of a (windows, samples) float32 array"""
+        audible = np.abs(frames).max(axis=1) >= self.silence_peak
+        power = np.einsum('ij,ij->i', frames, frames) / frames.shape[1]
+        level_db = 10 * np.log10(np.maximum(power, 10 ** (self.silence_db / 10)))
+
+        # floor[i] = min(previous floor + rise, min over j <= i of level[j] + rise * (i - j))
+        steps = np.arange(len(level_db)) * self.rise_db
+        floor_db = np.minimum.accumulate(level_db - steps) + steps
+        if self.floor_db is not None:
+            floor_db = np.minimum(floor_db, self.floor_db + self.rise_db + steps)
+        self.floor_db = float(floor_db[-1])
+
+        noise = (floor_db < self.max_floor_db) & (level_db < floor_db + self.margin_db)
+        return audible & ~noise
+
+class StreamingVAD:
+    """Frame-by-frame Silero VAD that keeps up with the capture buffer.
+
+    A worker feeds every 512-sample window to the model as soon as it has been
+    captured and tracks speech regions with the same hysteresis rules as
+    ``silero_vad.get_speech_timestamps``. By the time recording stops the
+    speech timestamps are already known, so VAD adds nothing to post-stop
+    latency.
+    """
+
+    WINDOW = 512  # Samples per Silero window at 16 kHz
+    BATCH = 64  # Windows gated per vectorized energy pass (~2s)
+
+    def __init__(self, audio_buffer, frame_probability, threshold, reset=None, gate=None,
+                 min_speech_ms=250, min_silence_ms=100, speech_pad_ms=30, poll_interval=0.05,
+                 on_endpoint=None, endpoint_silence_ms=1500, endpoint_min_speech_ms=600):
+        sample_rate = audio_buffer.sample_rate
+        self.audio_buffer = audio_buffer
+        self.frame_probability = frame_probability  # float32 window -> speech probability
+        self.reset = reset  # Clears the model's recurrent state before a new recording
+        self.gate = gate  # Optional EnergyGate: rejected windows never reach the model
+        if gate:
+            gate.reset()  # Every recording measures its own noise floor
+        self._gated = False  # Last window was rejected by the gate
+        self.threshold = threshold
+        self.neg_threshold = max(threshold - 0.15, 0.01)
+        self.min_speech = sample_rate * min_speech_ms // 1000
+        self.min_silence = sample_rate * min_silence_ms // 1000
+        self.speech_pad = sample_rate * speech_pad_ms // 1000
+        self.poll_interval = poll_interval
+        self._scale = 1.0 / 32768 if audio_buffer.dtype.kind == 'i' else 1.0
+
+        # Endpointing: call on_endpoint once speech is followed by enough silence
+        self.on_endpoint = on_endpoint
+        self.endpoint_silence = sample_rate * endpoint_silence_ms // 1000
+        self.endpoint_min_speech = sample_rate * endpoint_min_speech_ms // 1000
+        self.endpoint_fired = False
+
+        self.position = 0  # Buffer frames analysed so far
+        self.windows = 0
+        self.gated_windows = 0  # Rejected by the energy gate (tier 1)
+        self.model_windows = 0  # Sent to Silero (tier 2)
+        self.max_probability = 0.0
+        self.speech_windows = 0  # Windows at or above the threshold
+        self.last_speech_end = 0  # Buffer frame where the last speech window ended
+        self.regions = []  # Closed speech regions (unpadded), in buffer frames
+        self._speech_start = None  # Start of the region in progress
+        self._temp_end = 0  # Where the current run of silence began
+        self._frames = np.zeros((self.BATCH, self.WINDOW), dtype=np.float32)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.reset:
+            self.reset()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if not self._drain():
+                    self._stop.wait(self.poll_interval)
+            except Exception as e:
+                print(f"⚠️  Streaming VAD warning: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def _drain(self, final=False):
+        """Analyse every complete window captured so far; returns True if any were"""
+        available = self.audio_buffer.frames
+        processed = False
+        while available - self.position >= self.WINDOW:
+            count = min(self.BATCH, (available - self.position) // self.WINDOW)
+            chunk = self.audio_buffer.view(self.position, self.position + count * self.WINDOW)
+            frames = self._frames[:count]
+            np.multiply(chunk.reshape(count, self.WINDOW), self._scale, out=frames)
+            self._process_frames(frames)
+            processed = True
+
+        if final and available > self.position:
+            # Last partial window, zero-padded like silero does
+            chunk = self.audio_buffer.view(self.position, available)
+            frames = self._frames[:1]
+            frames[:] = 0
+            np.multiply(chunk, self._scale, out=frames[0, :len(chunk)])
+            self._process_frames(frames)
+            self.position = available
+            processed = True
+        return processed
+
+    def _process_frames(self, frames):
+        """Gate a batch of windows, then run the model on the candidates only"""
+        candidates = self.gate.candidates(frames) if self.gate else None
+        for index, window in enumerate(frames):
+            if candidates is None or candidates[index]:
+                if self._gated and self.reset:
+                    # The model never saw the silence - start fresh, as after a mute
+                    self.reset()
+                self._gated = False
+                self.model_windows += 1
+                probability = float(self.frame_probability(window))
+            else:
+                self._gated = True
+                self.gated_windows += 1
+                probability = 0.0
+            self._process_window(self.position, probability)
+            self.position += self.WINDOW
+
+    def _process_window(self, position, probability):
+        self.windows += 1
+        self.max_probability = max(self.max_probability, probability)
+
+        if probability >= self.threshold:
+            self.speech_windows += 1
+            self.last_speech_end = position + self.WINDOW
+            self._temp_end = 0
+            if self._speech_start is None:
+                self._speech_start = position
+            return
+
+        self._check_endpoint(position + self.WINDOW)
+
+        if probability < self.neg_threshold and self._speech_start is not None:
+            if not self._temp_end:
+                self._temp_end = position
+            if position - self._temp_end >= self.min_silence:
+                self._close_region(self._temp_end)
+
+    def _check_endpoint(self, position):
+        """Fire on_endpoint once after enough speech and enough trailing silence"""
+        if not self.on_endpoint or self.endpoint_fired or not self.last_speech_end:
+            return
+        if self.speech_windows * self.WINDOW < self.endpoint_min_speech:
+            return  # Too little speech so far - probably still getting started
+        if position - self.last_speech_end >= self.endpoint_silence:
+            self.endpoint_fired = True
+            self.on_endpoint()
+
+    def _close_region(self, end):
+        if end - self._speech_start > self.min_speech:
+            self.regions.append({'start': self._speech_start, 'end': end})
+        self._speech_start = None
+        self._temp_end = 0
+
+    @property
+    def open_speech_start(self):
+        """Start of the speech region still in progress (None during silence)"""
+        return self._speech_start
+
+    def speech_timestamps(self, include_open=True):
+        """Padded speech regions in buffer frames (same shape as silero_vad.get_speech_timestamps)"""
+        regions = [dict(region) for region in self.regions]
+        open_start = self._speech_start
+        if include_open and open_start is not None and self.position - open_start > self.min_speech:
+            regions.append({'start': open_start, 'end': self.position})
+
+        # Pad regions, splitting short gaps between neighbours (silero's rule)
+        for i, region in enumerate(regions):
+            if i == 0:
+                region['start'] = max(0, region['start'] - self.speech_pad)
+            if i != len(regions) - 1:
+                following = regions[i + 1]
+                silence = following['start'] - region['end']
+                if silence < 2 * self.speech_pad:
+                    region['end'] += silence // 2
+                    following['start'] = max(0, following['start'] - silence // 2)
+                else:
+                    region['end'] = min(self.position, region['end'] + self.speech_pad)
+                    following['start'] = max(0, following['start'] - self.speech_pad)
+            else:
+                region['end'] = min(self.position, region['end'] + self.speech_pad)
+        return regions
+
+    def finish(self):
+        """Stop the worker, analyse the remaining audio and return the final timestamps"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._drain(final=True)
+        if self._speech_start is not None:
+            if self.position - self._speech_start > self.min_speech:
+                self.regions.append({'start': self._speech_start, 'end': self.position})
+            self._speech_start = None
+        return self.speech_timestamps()
+
+    def abandon(self):
+        """Stop the worker without waiting (used by force recovery)"""
+        self._stop.set()
+
+    def summary(self):
+        """Windows rejected by each tier, for the log"""
+        return (f"{self.windows} windows: energy gate rejected {self.gated_windows}, "
+                f"Silero rejected {self.model_windows - self.speech_windows}, "
+                f"{self.speech_windows} speech")
+
+class StreamingTranscriber:
+    """Transcribes finished utterances in the background while recording continues.
+
+    A worker polls the speech regions found so far by ``StreamingVAD`` and
+    hands every stretch of speech that is already followed by enough silence
+    to ``transcribe``. When recording stops only the last, unfinished
+    utterance is left to decode.
+    """
+
+    def __init__(self, audio_buffer, vad, transcribe, prepare=None,
+                 poll_interval=0.5, min_silence_ms=700, pad_ms=100):
+        self.audio_buffer = audio_buffer
+        self.vad = vad  # StreamingVAD running over the same buffer
+        self.transcribe = transcribe  # audio -> text
+        self.prepare = prepare  # Returns True when ready; called once on the worker
+        self.poll_interval = poll_interval
+        sample_rate = audio_buffer.sample_rate
+        self.min_silence = int(min_silence_ms * sample_rate / 1000)
+        self.pad = int(pad_ms * sample_rate / 1000)
+
+        self.cursor = 0  # Buffer frame where the unconsumed audio starts
+        self.texts = []
+        self.utterances = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        if self.prepare:
+            try:
+                ready = self.prepare()
+            except Exception as e:
+                print(f"⚠️  Streaming transcription could not prepare model: {e}")
+                ready = False
+            if not ready:
+                return  # Everything is left for the normal path at stop
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._consume_finished_utterances()
+            except Exception as e:
+                print(f"⚠️  Streaming transcription warning: {e}")
+
+    def _consume_finished_utterances(self):
+        """Transcribe speech that has ended, advance the cursor past it"""
+        # Frontier first, then the open region: speech that starts after these
+        # reads can only start at or beyond the frontier
+        frontier = self.vad.position
+        open_start = self.vad.open_speech_start
+        regions = [r for r in self.vad.speech_timestamps(include_open=False) if r['end'] > self.cursor]
+        if not regions:
+            return
+
+        # An utterance is final once enough silence follows it before the next
+        # speech (closed or still in progress): a breath doesn't end a sentence
+        finished_end = None
+        for i, region in enumerate(regions):
+            if i + 1 < len(regions):
+                next_start = regions[i + 1]['start']
+            elif open_start is not None:
+                next_start = open_start
+            else:
+                next_start = frontier
+            if next_start - region['end'] >= self.min_silence:
+                finished_end = region['end']
+        if finished_end is None:
+            return
+
+        start = max(self.cursor, regions[0]['start'] - self.pad)
+        stop = min(frontier, finished_end + self.pad)
+        text = self.transcribe(self.audio_buffer.to_float32(start, stop))
+        if text:
+            self.texts.append(text)
+        self.utterances += 1
+        self.cursor = stop
+
+    def finish(self):
+        """Stop the worker (waiting for an in-flight utterance) and return (tail_start, texts)"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.cursor, list(self.texts)
+
+    def abandon(self):
+        """Stop the worker without waiting (used by force recovery)"""
+        self._stop.set()
+
+class AudioPreprocessor:
+    """Speech-band filter, noise gate, normalizer and compressor with precomputed coefficients.
+
+    Pipeline order (research-backed): Filter → Noise Reduction → Normalize →
+    Compress → Trim. Every stage transforms one float32 working buffer in
+    place: the band-pass runs block by block with carried filter state, and
+    the gate and compressor share a single magnitude scratch array, so a long
+    recording never briefly exists as several float64 copies. The band-pass
+    is designed once per sample rate as a single cascade of second-order
+    sections, and the noise floor comes from an O(n) partition.
+    """
+
+    # Noise gate per accuracy mode: (quietest fraction used as noise profile, gain below it)
+    # Clarity/Max modes use more aggressive noise reduction
+    GATE_SETTINGS = {
+        'fast': (0.10, 0.05),
+        'clarity': (0.05, 0.02),
+        'max': (0.05, 0.02)
+    }
+    COMPRESSOR_THRESHOLD_DB = -20
+    TRIM_THRESHOLD = 0.01  # Silence threshold for trimming
+    TRIM_MARGIN_S = 0.1  # Margin kept before and after the sound
+    FILTER_BLOCK = 1 << 16  # Samples filtered per sosfilt call (bounds the temporary)
+
+    _sos_cache = {}  # sample rate -> combined band-pass SOS
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def band_pass_sos(cls, sample_rate):
+        """300 Hz - 7.8 kHz band-pass as one SOS cascade, designed once per sample rate"""
+        sos = cls._sos_cache.get(sample_rate)
+        if sos is None:
+            from scipy import signal
+            # Research shows speech intelligibility is primarily in 300Hz-8kHz range
+            # Using 7800 Hz instead of 8000 Hz to avoid filter edge case (must be < fs/2)
+            sos_high = signal.butter(4, 300, 'hp', fs=sample_rate, output='sos')
+            sos_low = signal.butter(4, 7800, 'lp', fs=sample_rate, output='sos')
+            sos = np.vstack([sos_high, sos_low])
+            cls._sos_cache[sample_rate] = sos
+        return sos
+
+    @staticmethod
+    def working_buffer(audio):
+        """The array itself if it is already a writeable float32 buffer, else one float32 copy"""
+        if audio.dtype == np.float32 and audio.flags.c_contiguous and audio.flags.writeable:
+            return audio
+        return np.array(audio, dtype=np.float32)
+
+    def filter_state(self):
+        """Zero initial state for the band-pass cascade"""
+        return np.zeros((len(self.band_pass_sos(self.sample_rate)), 2))
+
+    def filter_blocks(self, audio, zi):
+        """Band-pass `audio` in place block by block, returning the carried filter state
+
+        Each block is filtered in float64 (a block-sized temporary) and written
+        back, so the float32 buffer keeps double-precision filter accuracy.
+        """
+        from scipy import signal
+        sos = self.band_pass_sos(self.sample_rate)
+        for start in range(0, len(audio), self.FILTER_BLOCK):
+            block = audio[start:start + self.FILTER_BLOCK]
+            block[:], zi = signal.sosfilt(sos, block, zi=zi)
+        return zi
+
+    def band_pass(self, audio):
+        self.filter_blocks(audio, self.filter_state())
+        return audio
+
+    @staticmethod
+    def noise_floor(magnitude, fraction):
+        """Value of the quietest `fraction` of samples - O(n) selection, no full sort
+
+        Partitions `magnitude` in place (its order is scrambled afterwards).
+        """
+        k = int(len(magnitude) * fraction)
+        magnitude.partition(k)
+        return magnitude[k]
+
+    def gate_settings(self, mode):
+        return self.GATE_SETTINGS.get(mode, self.GATE_SETTINGS['clarity'])
+
+    @staticmethod
+    def speech_samples(values, regions):
+        """values inside the (start, end) regions, moved to the front in place (all of values without regions)"""
+        if not regions:
+            return values
+        position = 0
+        for start, end in regions:
+            values[position:position + end - start] = values[start:end]
+            position += end - start
+        return values[:position]
+
+    def noise_gate(self, audio, mode, scratch=None, regions=None):
+        """Gate below the noise floor of the speech regions (of all of audio without regions)"""
+        fraction, floor_gain = self.gate_settings(mode)
+        magnitude = np.abs(audio, out=scratch)
+        noise_threshold = self.noise_floor(self.speech_samples(magnitude, regions), fraction)
+        np.abs(audio, out=magnitude)  # Partition scrambled it
+        return self.apply_gate(audio, magnitude, noise_threshold, floor_gain)
+
+    @staticmethod
+    def speech_peak(audio, regions):
+        """Largest |sample| inside the regions (None without regions: normalize finds it)"""
+        if not regions:
+            return None
+        return max((max(audio[start:end].max(), -audio[start:end].min())
+                    for start, end in regions if end > start), default=0.0)
+
+    @staticmethod
+    def apply_gate(audio, magnitude, noise_threshold, floor_gain):
+        """Attenuate samples at or below the noise floor, pass the rest untouched"""
+        np.multiply(audio, floor_gain, out=audio, where=magnitude <= noise_threshold)
+        return audio
+
+    @staticmethod
+    def normalize(audio, peak=0.95, max_val=None):
+        """Scale to `peak`; max_val can be passed in when it is already known"""
+        if len(audio) == 0:
+            return audio
+        if max_val is None:
+            max_val = max(audio.max(), -audio.min())
+        if max_val > 0:
+            audio *= peak / max_val  # Normalize to 95% max
+        return audio
+
+    def compress(self, audio, ratio, scratch=None):
+        """Dynamic range compression: compress loud parts above the threshold
+
+        Equivalent to the dB-domain curve threshold + (level - threshold) / ratio,
+        applied as a gain (level / threshold) ** (1 / ratio - 1) on over-threshold
+        samples only.
+        """
+        threshold = np.float32(10 ** (self.COMPRESSOR_THRESHOLD_DB / 20))
+        gain = np.abs(audio, out=scratch)
+        over = gain > threshold
+        gain /= threshold
+        np.power(gain, np.float32(1.0 / ratio - 1.0), out=gain, where=over)
+        np.multiply(audio, gain, out=audio, where=over)
+        return audio
+
+    def trim(self, audio, scratch=None):
+        """Trim silence from beginning and end, keeping a small margin (returns a view)"""
+        non_silent = np.abs(audio, out=scratch) > self.TRIM_THRESHOLD
+        if non_silent.any():
+            first_sound = np.argmax(non_silent)
+            last_sound = len(audio) - np.argmax(non_silent[::-1]) - 1
+            margin = int(self.TRIM_MARGIN_S * self.sample_rate)
+            start = max(0, first_sound - margin)
+            end = min(len(audio), last_sound + margin)
+            audio = audio[start:end]
+        return audio
+
+    def stages(self, mode='clarity', compression_ratio=6, scratch=None, regions=None):
+        """(name, function) pairs for each in-place pipeline step
+
+        With regions the noise floor and peak come from the speech only, as
+        they did when the speech was cut out before preprocessing.
+        """
+        return [
+            ('filter', self.band_pass),
+            ('noise gate', lambda audio: self.noise_gate(audio, mode, scratch, regions)),
+            ('normalize', lambda audio: self.normalize(audio, max_val=self.speech_peak(audio, regions))),
+            ('compress', lambda audio: self.compress(audio, compression_ratio, scratch)),
+            ('trim', lambda audio: self.trim(audio, scratch)),
+        ]
+
+    def process(self, audio, mode='clarity', compression_ratio=6, trim=True, regions=None):
+        """Run the full pipeline for one accuracy mode
+
+        A float32 input is transformed in place (pass a copy to keep the
+        original); the result is a view into that buffer. regions are the
+        (start, end) speech ranges the statistics are taken from.
+        """
+        audio = self.working_buffer(audio)
+        scratch = np.empty_like(audio)  # Magnitude scratch shared by gate, compressor and trim
+        for name, stage in self.stages(mode, compression_ratio, scratch, regions):
+            if name == 'trim' and not trim:
+                continue
+            audio = stage(audio)
+        return audio
+
+class StreamingPreprocessor:
+    """Runs the preprocessing pipeline alongside the capture instead of after stop.
+
+    Capture blocks are band-passed as they arrive, carrying the sosfilt state
+    from block to block, while a magnitude histogram and the running peak are
+    kept up to date. At stop only the cheap per-sample stages remain: the
+    noise floor is read from the histogram (and made exact by selecting
+    inside its one bin), then gate, normalization and compression run in
+    place. The result matches ``AudioPreprocessor.process(..., trim=False)``
+    on the same audio and speech regions, which stays the reference
+    implementation.
+    """
+
+    # Log-spaced magnitude bins; the first/last edges catch exact zeros and overshoot
+    HISTOGRAM_EDGES = np.concatenate(([0.0], np.logspace(-9, 1, 2048), [np.inf]))
+
+    def __init__(self, audio_buffer, preprocessor, mode, compression_ratio, poll_interval=0.1):
+        self.audio_buffer = audio_buffer
+        self.preprocessor = preprocessor
+        self.mode = mode
+        self.compression_ratio = compression_ratio
+        self.poll_interval = poll_interval
+        self.output = AudioCaptureBuffer(audio_buffer.sample_rate, dtype=np.float32)
+
+        self.position = 0  # Capture frames filtered so far
+        self.peak = 0.0  # Running max |x| of the filtered signal
+        self._counts = np.zeros(len(self.HISTOGRAM_EDGES) - 1, dtype=np.int64)
+        self._zi = preprocessor.filter_state()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._drain()
+            except Exception as e:
+                print(f"⚠️  Streaming preprocessing warning: {e}")
+
+    def _drain(self):
+        """Filter newly captured frames and fold them into the running statistics"""
+        available = self.audio_buffer.frames
+        if available <= self.position:
+            return
+        block = self.audio_buffer.to_float32(self.position, available)
+        self._zi = self.preprocessor.filter_blocks(block, self._zi)
+        self.output.write(block)
+
+        magnitude = np.abs(block, out=block)  # Filtered audio is already stored
+        bins = np.searchsorted(self.HISTOGRAM_EDGES, magnitude, side='right') - 1
+        self._counts += np.bincount(bins, minlength=len(self._counts))
+        self.peak = max(self.peak, float(magnitude.max()))
+        self.position = available
+
+    def noise_floor(self, magnitude, fraction):
+        """Exact k-th smallest magnitude: histogram finds the bin, selection inside it"""
+        k = int(len(magnitude) * fraction)
+        cumulative = np.cumsum(self._counts)
+        b = int(np.searchsorted(cumulative, k, side='right'))
+        below = int(cumulative[b - 1]) if b > 0 else 0
+        low, high = self.HISTOGRAM_EDGES[b], self.HISTOGRAM_EDGES[b + 1]
+        in_bin = magnitude[(magnitude >= low) & (magnitude < high)]
+        return np.partition(in_bin, k - below)[k - below]
+
+    def finish(self, regions=None):
+        """Stop the worker, process the remaining frames and return the cleaned audio (untrimmed)
+
+        With speech regions (known from the streaming VAD by now) the noise
+        floor and peak come from the speech only, as in the batch path; the
+        histogram and running peak cover the whole capture.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._drain()
+
+        audio = self.output.view()
+        if len(audio) == 0:
+            return audio
+        fraction, floor_gain = self.preprocessor.gate_settings(self.mode)
+        magnitude = np.abs(audio)
+        if regions:
+            noise_threshold = self.preprocessor.noise_floor(
+                self.preprocessor.speech_samples(magnitude, regions), fraction)
+            np.abs(audio, out=magnitude)  # Selection scrambled it
+        else:
+            noise_threshold = self.noise_floor(magnitude, fraction)
+        self.preprocessor.apply_gate(audio, magnitude, noise_threshold, floor_gain)
+
+        if regions:
+            peak = self.preprocessor.speech_peak(audio, regions)
+        else:
+            # The gate only lowers samples at or below the floor, so the peak survives it
+            peak = self.peak if self.peak > noise_threshold else self.peak * floor_gain
+        self.preprocessor.normalize(audio, max_val=peak)
+        self.preprocessor.compress(audio, self.compression_ratio, scratch=magnitude)
+        return audio
+
+    def abandon(self):
+        """Stop the worker without waiting (used by force recovery)"""
+        self._stop.set()
+
+def speech_regions(speech_timestamps, length, sample_rate, max_gap_s=1.0, max_clip_s=28.0):
+    """Turn VAD timestamps into (start, end) sample ranges over the original buffer
+
+    Nothing is copied or concatenated: the ranges go to the decoder as clips.
+    Regions closer than max_gap_s are merged (the pause between them is kept,
+    which the decoder handles better than glued-together utterances) as long
+    as the clip stays within one 30s Whisper window, so short bursts of speech
+    don't each cost a separate encoder pass.
+    """
+    max_gap, max_clip = int(max_gap_s * sample_rate), int(max_clip_s * sample_rate)
+    regions = []
+    for timestamp in speech_timestamps:
+        start, end = max(0, timestamp['start']), min(timestamp['end'], length)
+        if end <= start:
+            continue
+        if regions and start - regions[-1][1] <= max_gap and end - regions[-1][0] <= max_clip:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+def build_prompt(templates, name, language, mode, vocabulary=()):
+    """Initial prompt text from a template, with the user's vocabulary as the last sentence"""
+    template = templates.get(name) or templates['detailed-v1']
+    texts = template.get(language) or template.get('en', {})
+    text = texts.get(mode, texts.get('default', ''))
+    if vocabulary:
+        # Last, so it survives budget trimming (Whisper also keeps the end of long prompts)
+        text = f"{text} {'Vocabulario' if language == 'es' else 'Vocabulary'}: {', '.join(vocabulary)}."
+    return text.strip()
+
+def long_form_chunks(regions, sample_rate, max_chunk_s=28.0, max_gap_s=1.5):
+    """Pack speech regions into chunks of at most max_chunk_s for batched decoding
+
+    Chunks only end at silences between regions, so no word is cut in two;
+    a single region longer than a chunk (nonstop talking) is the exception
+    and gets split at the limit. Regions more than max_gap_s apart always
+    start a new chunk, so the silence VAD removed is never decoded again.
+    """
+    max_len, max_gap = int(max_chunk_s * sample_rate), int(max_gap_s * sample_rate)
+    chunks = []
+    for start, end in regions:
+        while end - start > max_len:
+            chunks.append((start, start + max_len))
+            start += max_len
+        if chunks and start - chunks[-1][1] <= max_gap and end - chunks[-1][0] <= max_len:
+            chunks[-1] = (chunks[-1][0], end)
+        else:
+            chunks.append((start, end))
+    return chunks
+
+class ResidencyPolicy:
+    """How long model weights stay loaded after a dictation.
+
+    unload: park right away (smallest footprint, every dictation reloads)
+    always: never park (fastest, the model stays in memory)
+    ttl: park after ttl_s without a dictation
+    predictive: keep the model while the next dictation is likely - 1.5x the
+    median of the recent gaps between dictations, within min_ttl_s..max_ttl_s;
+    someone who dictates less often than that gets it parked right away.
+    """
+
+    POLICIES = ('unload', 'always', 'ttl', 'predictive')
+
+    def __init__(self, policy='unload', ttl_s=120, min_ttl_s=30, max_ttl_s=600, history=10):
+        if policy not in self.POLICIES:
+            print(f"⚠️  Unknown model_residency '{policy}' - using 'unload'")
+            policy = 'unload'
+        self.policy = policy
+        self.ttl_s = ttl_s
+        self.min_ttl_s = min_ttl_s
+        self.max_ttl_s = max_ttl_s
+        self.gaps = deque(maxlen=history)  # Seconds from one dictation's end to the next start
+        self.last_end = None
+
+    def dictation_started(self, now=None):
+        now = now or time.time()
+        if self.last_end is not None:
+            self.gaps.append(now - self.last_end)
+
+    def dictation_finished(self, now=None):
+        self.last_end = now or time.time()
+
+    def keep_seconds(self):
+        """How long to keep the weights after a dictation (0 = park now)"""
+        if self.policy == 'unload':
+            return 0
+        if self.policy == 'always':
+            return float('inf')
+        if self.policy == 'ttl' or len(self.gaps) < 3:
+            return self.ttl_s  # Predictive falls back to the TTL until it has some history
+        expected = 1.5 * sorted(self.gaps)[len(self.gaps) // 2]
+        if expected > self.max_ttl_s:
+            return 0  # The next dictation is probably further away than we'd hold memory
+        return max(self.min_ttl_s, expected)
+
+    def should_park(self, now=None):
+        if self.last_end is None:
+            return False
+        return (now or time.time()) - self.last_end >= self.keep_seconds()
+
+class DecodeCancelled(Exception):
+    """A decode stopped early because its result is no longer wanted"""
+
+class InferenceWorker:
+    """Whisper models and decoding in a long-lived subprocess.
+
+    The app sends PCM over a pipe and gets segments back, so CTranslate2 and
+    its caching allocator never grow the app itself. Recycling the process
+    after max_jobs dictations or max_growth_mb of RSS growth gives every
+    byte back to the OS - only between dictations, never between the decodes
+    of one - and a decode that stops answering for timeout_s is killed
+    instead of left running in an abandoned thread.
+    """
+
+    def __init__(self, budget_mb=2000, max_jobs=20, max_growth_mb=500, timeout_s=120):
+        self.budget_mb = budget_mb
+        self.max_jobs = max_jobs
+        self.max_growth_mb = max_growth_mb
+        self.timeout_s = timeout_s
+        self.process = None
+        self.conn = None
+        self.loaded = set()  # Keys loaded in the current process
+        self.jobs = 0  # Dictations served by the current process
+        self.base_rss_mb = None  # Worker RSS after its first decode
+        self.rss_mb = 0.0
+        self.recycles = 0
+        self._lock = threading.RLock()
+
+    def _alive(self):
+        process = self.process
+        return process is not None and process.poll() is None
+
+    def _ensure_started(self):
+        """Start the worker if needed; returns the connection to it"""
+        if self._alive() and self.conn is not None:
+            return self.conn
+        import multiprocessing
+        import subprocess
+        self.kill()
+        # A fresh interpreter that imports only the inference module - not a fork
+        # of the app's threads and audio stream, and no rumps/pynput/sounddevice
+        conn, child_conn = multiprocessing.Pipe()
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'voice_to_text_inference.py')
+        self.process = subprocess.Popen(
+            [sys.executable, script, str(child_conn.fileno()), str(self.budget_mb)],
+            pass_fds=(child_conn.fileno(),))
+        child_conn.close()
+        self.conn = conn
+        self.loaded = set()
+        self.jobs = 0
+        self.base_rss_mb = None
+        print(f"🧩 Inference worker started (pid {self.process.pid})")
+        return conn
+
+    def _receive(self, conn, timeout=None):
+        """Next reply from the worker; kills it if it stays silent past timeout"""
+        try:
+            ready = timeout is None or conn.poll(timeout)
+            reply = conn.recv() if ready else None
+        except (EOFError, OSError):
+            # Also what a kill() from another thread looks like from here
+            self.kill()
+            raise RuntimeError("inference worker exited unexpectedly")
+        if reply is None:
+            self.kill()
+            raise TimeoutError(f"inference worker hung for {timeout}s - killed")
+        if reply[0] == 'error':
+            raise RuntimeError(f"inference worker: {reply[1]}")
+        return reply
+
+    def is_loaded(self, key):
+        return self._alive() and key in self.loaded
+
+    def load(self, key):
+        """Load key in the worker; returns (measured MB, seconds)"""
+        with self._lock:
+            conn = self._ensure_started()
+            conn.send(('load', key))
+            _, size_mb, seconds = self._receive(conn)  # No timeout: the first load downloads
+            self.loaded.add(key)
+            return size_mb, seconds
+
+    def transcribe(self, key, audio_array, options, cancelled=None):
+        """Decode in the worker and return its segments
+
+        They are all collected while holding the lock, so the pipe is free
+        again (and the lock released) before the caller sees any of them.
+        Once cancelled() turns true the worker is told to stop after its
+        current segment, and the segments so far are returned.
+        """
+        with self._lock:
+            conn = self._ensure_started()
+            conn.send(('transcribe', key, options))
+            conn.send_bytes(np.ascontiguousarray(audio_array, dtype=np.float32))
+            segments = []
+            cancel_sent = False
+            while True:
+                reply = self._receive(conn, self.timeout_s)
+                if reply[0] == 'done':
+                    break
+                segments.append(SimpleNamespace(**reply[1]))
+                if cancelled and not cancel_sent and cancelled():
+                    conn.send(('cancel',))
+                    cancel_sent = True
+            self.loaded.add(key)  # Only once the worker has decoded with it
+            self.rss_mb = reply[1]
+            if self.base_rss_mb is None:
+                self.base_rss_mb = self.rss_mb
+            return segments
+
+    def dictation_finished(self):
+        """Count one dictation; recycle the worker if it is due (call between dictations only)"""
+        with self._lock:
+            if not self._alive():
+                return
+            self.jobs += 1
+            growth = self.rss_mb - (self.base_rss_mb or self.rss_mb)
+            if self.jobs >= self.max_jobs or growth >= self.max_growth_mb:
+                print(f"♻️  Recycling inference worker after {self.jobs} dictations "
+                      f"({self.rss_mb:.0f}MB, +{growth:.0f}MB since its first decode)")
+                self.recycles += 1
+                self.stop()
+
+    def stop(self):
+        """Ask the worker to exit (kill it if it doesn't)"""
+        with self._lock:
+            process, conn = self.process, self.conn
+            if process is None:
+                return
+            try:
+                conn.send(('stop',))
+            except (AttributeError, OSError, ValueError):
+                pass
+            try:
+                process.wait(timeout=5)
+            except Exception:
+                pass
+            self.kill()
+
+    def kill(self):
+        """Terminate the worker immediately (used for hung decodes and force recovery)
+
+        Safe from any thread: a transcribe waiting on the pipe holds its own
+        reference and sees the closed connection as an error.
+        """
+        process, self.process = self.process, None
+        conn, self.conn = self.conn, None
+        if process is not None and process.poll() is None:
+            process.kill()
+            try:
+                process.wait(timeout=5)
+            except Exception:
+                pass
+        if conn is not None:
+            conn.close()
+        self.loaded = set()
+
+    def summary(self):
+        growth = self.rss_mb - (self.base_rss_mb or self.rss_mb)
+        return (f"{self.jobs}/{self.max_jobs} dictations, {self.rss_mb:.0f}MB (+{growth:.0f}MB), "
+                f"{self.recycles} recycles")
+
 class VoiceToTextMenuBarEnhanced(rumps.App):
     def __init__(self):
         super(VoiceToTextMenuBarEnhanced, self).__init__(
@@ -101,7 +1361,7 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
         )
 
         # Load language preferences
-        self.config_file = os.path.expanduser("~/.voice_to_text_config.json")
+        self.config_file = CONFIG_FILE
         self.load_preferences()
 
         # Menu items
@@ -112,6 +1372,8 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
         self.stop_button.title = "Stop Recording (hidden)"  # Will show when recording
         self.force_stop_button = rumps.MenuItem("🚨 Force Stop (Emergency)", callback=self.emergency_stop)
         self.force_stop_button.title = "🚨 Force Stop (hidden)"  # Will show when stuck
+        self.microphone_item = rumps.MenuItem("🎙️ Microphone: Released", callback=self.toggle_warm_microphone)
+        self.refined_item = rumps.MenuItem("✨ Refined Text: none", callback=self.copy_refined_text)
 
         # Language selection menu items
         self.input_lang_menu = {
@@ -152,6 +1414,8 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             self.memory_item,
             self.stop_button,
             self.force_stop_button,
+        ] + ([self.microphone_item] if self.keep_microphone_warm else []) + (
+            [self.refined_item] if self.two_pass else []) + [
             None,  # Separator
             [self.accuracy_mode_label, list(self.accuracy_mode_menu.values())],
             None,  # Separator
@@ -167,19 +1431,40 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
         self.processing = False  # Flag to prevent starting new recording while processing
         self.typing = False  # Flag to prevent keyboard listener interference while auto-typing
         self.downloading_model = False  # Flag to indicate first-time model download (watchdog should ignore)
+        self.capture_active = False  # Callback writes to the capture buffer (else to the pre-roll)
+        self.capture_lock = threading.Lock()  # Serialises capture start/stop with the callback
+        self.preroll = None  # Pre-roll ring, only used with a warm microphone
+        self.streaming_vad = None  # Frame-by-frame VAD running alongside the capture
+        self.streaming_preprocessor = None  # Preprocessing running alongside the capture
+        self.streaming_transcriber = None  # Background utterance transcriber (streaming mode)
+        self.model_preparing = None  # Thread loading the model while the user speaks
+        self.user_input_events = 0  # Keys typed and clicks by the user (two-pass patches only if unchanged)
+        self.refined_text = None  # Two-pass refinement that could not replace its draft
+        self.refine_thread = None  # Two-pass refinement running after its dictation finished
+        self.refining = False  # A refinement is (about to be) decoding - models stay loaded until it is done
+        self.dictations = 0  # Recordings started so far (a refinement is stale once this moves on)
+        self.typed_output = ""  # Text typed so far for this dictation (streaming output)
 
         # Translation support
         self.translation_available = False
 
-        # Model management (lazy loading for memory optimization)
-        self.whisper_model_small = None
-        self.whisper_model_medium = None
+        # Model management (lazy loading within a measured memory budget)
+        self.model_pool = ModelPool(load_whisper_model, budget_mb=self.model_memory_budget_mb)
+        self.residency = ResidencyPolicy(self.model_residency, ttl_s=self.model_ttl_s)
+        self.inference_worker = None
+        if self.use_inference_worker:
+            # Models live in a subprocess instead of the pool above
+            self.inference_worker = InferenceWorker(
+                budget_mb=self.model_memory_budget_mb,
+                max_jobs=self.worker_max_jobs,
+                max_growth_mb=self.worker_max_growth_mb,
+                timeout_s=self.worker_timeout_s
+            )
         self.vad_model = None
-        self.models_loaded = {'small': False, 'medium': False, 'vad': False}
-        self.last_model_used = None  # Track which model was used last
+        self.energy_gate = None  # Cheap tier in front of the VAD model
+        self.no_speech_skips = 0  # Recordings that returned to Ready without the model
 
         # Memory optimization settings
-        self.aggressive_memory_cleanup = True  # Unload unused models after each use
         self.last_activity_time = time.time()  # Track when app was last used
 
         # Watchdog for stuck states
@@ -202,6 +1487,22 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
         self.typing = False
         self.last_action = None  # Reset action tracking
         self.last_hotkey_time = 0  # Reset debounce timer
+        self.capture_active = False
+
+        # Let go of any streaming workers - they may be the thing that is stuck
+        if self.streaming_transcriber:
+            self.streaming_transcriber.abandon()
+            self.streaming_transcriber = None
+        if self.streaming_vad:
+            self.streaming_vad.abandon()
+            self.streaming_vad = None
+        if self.streaming_preprocessor:
+            self.streaming_preprocessor.abandon()
+            self.streaming_preprocessor = None
+        self.model_preparing = None  # Don't wait on a load that may be stuck
+        if self.inference_worker:
+            # A hung decode is killed, not left running (the next use starts a fresh worker)
+            self.inference_worker.kill()
 
         # Force close any stuck audio streams
         if hasattr(self, 'stream'):
@@ -224,6 +1525,8 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 # Delete reference regardless
                 delattr(self, 'stream')
                 print("   ✅ Audio stream cleared")
+                if self.keep_microphone_warm:
+                    self.microphone_item.title = "🎙️ Microphone: Released (opens on next recording)"
             except Exception as e:
                 print(f"   ⚠️  Stream cleanup error: {e}")
                 # Force delete even if error
@@ -294,7 +1597,6 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
     def memory_monitor(self):
         """Monitor memory usage and perform automatic cleanup"""
         check_interval = 30  # Check every 30 seconds
-        idle_timeout = 300  # 5 minutes of inactivity
         memory_warning_threshold = 1500  # Warn if using more than 1.5GB
 
         while True:
@@ -316,21 +1618,24 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                     # High - over 1.5 GB
                     self.memory_item.title = f"Memory: {int(memory_mb)} MB 🔴"
 
-                # Check if idle for too long (5 minutes)
                 time_since_activity = time.time() - self.last_activity_time
-                if time_since_activity > idle_timeout and not self.recording and not self.processing:
-                    # Unload all models if idle for too long
-                    if self.models_loaded['small'] or self.models_loaded['medium']:
-                        print(f"\n💤 App idle for {int(time_since_activity/60)} minutes - unloading models to save memory")
-                        self.unload_all_models()
-                        self.cleanup_memory()
-                        new_memory = process.memory_info().rss / 1024 / 1024
-                        print(f"   Memory after cleanup: {new_memory:.0f}MB")
-                        # Update memory display immediately after cleanup
-                        self.memory_item.title = f"Memory: {int(new_memory)} MB ✅"
+
+                # Release a warm microphone once nobody has used it for a while
+                if (self.keep_microphone_warm and hasattr(self, 'stream') and not self.recording
+                        and time_since_activity > self.warm_microphone_idle_s):
+                    print(f"\n💤 Microphone idle for {int(time_since_activity)}s - releasing device")
+                    self.release_warm_microphone()
+
+                # Residency policy: park the weights once the next dictation looks unlikely
+                # (the only idle unloading - it decides how long models stay loaded)
+                if not self.recording and not self.processing and self.residency.should_park():
+                    if self.release_models():
+                        print(f"\n💤 No dictation for {int(time.time() - self.residency.last_end)}s - "
+                              f"parked model weights ({self.residency.policy} policy)")
+                        self.model_pool.release_memory()
 
                 # Warn if memory is too high
-                elif memory_mb > memory_warning_threshold:
+                if memory_mb > memory_warning_threshold:
                     print(f"\n⚠️  High memory usage detected: {memory_mb:.0f}MB")
                     # Force aggressive cleanup
                     self.cleanup_memory()
@@ -347,107 +1652,75 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             except Exception as e:
                 print(f"⚠️  Memory monitor error: {e}")
 
-    def warmup_model(self, model):
-        """Warm up model with synthetic audio to eliminate cold-start penalty"""
-        try:
-            print("   🔥 Warming up model (eliminating cold-start)...")
-
-            # Create 3 seconds of minimal audio (near-silence with tiny variations)
-            # This is enough to initialize all internal caches
-            warmup_duration = 3  # seconds
-            warmup_samples = self.sample_rate * warmup_duration
-
-            # Generate minimal audio (very quiet tone to simulate speech)
-            # Using a simple sine wave at speech frequency (200 Hz)
-            t = np.linspace(0, warmup_duration, warmup_samples)
-            warmup_audio = 0.01 * np.sin(2 * np.pi * 200 * t)  # Very quiet 200 Hz tone
-
-            # Save to temporary WAV file
-            warmup_file = tempfile.NamedTemporaryFile(delete=False, suffix='_warmup.wav')
-            warmup_path = warmup_file.name
-
-            with wave.open(warmup_path, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(self.sample_rate)
-                audio_bytes = (warmup_audio * 32767).astype(np.int16).tobytes()
-                wf.writeframes(audio_bytes)
-
-            # Run a quick transcription to warm up all caches
-            # Use minimal settings for speed
-            _ = model.transcribe(
-                warmup_path,
-                language='en',
-                beam_size=1,  # Fastest
-                temperature=0.0,
-                vad_filter=False
-            )
-
-            # Clean up warmup file
-            os.unlink(warmup_path)
-
-            print("   ✅ Model warmed up! First recording will be fast.")
-
-        except Exception as e:
-            print(f"   ⚠️  Warmup failed (non-critical): {e}")
-            # Non-critical - continue without warmup
-            pass
+    def mode_config(self, mode=None):
+        """Settings of an accuracy mode with the config file's overrides applied"""
+        mode = mode if mode in ACCURACY_MODES else self.accuracy_mode
+        settings = dict(ACCURACY_MODES.get(mode, ACCURACY_MODES['clarity']))
+        settings.update(self.mode_overrides.get(mode, {}))
+        return settings
+
+    def model_variant(self, mode=None):
+        """Registry name and entry of the model a mode uses for the current input language"""
+        name = self.mode_config(mode)['model_name']
+        variant = MODEL_VARIANTS.get(name, {'source': name, 'download_mb': None, 'languages': None})
+        if variant['languages'] and self.input_language not in variant['languages']:
+            # English-only variants (distil-*) can't transcribe other languages
+            default = ACCURACY_MODES.get(mode or self.accuracy_mode, ACCURACY_MODES['clarity'])['model_name']
+            name = default if default != name else 'small'
+            variant = MODEL_VARIANTS.get(name, MODEL_VARIANTS['small'])
+        return name, variant
+
+    def model_key(self, mode=None):
+        """Model pool key for an accuracy mode: (model source, compute type, (CPU threads, workers))"""
+        settings = self.mode_config(mode)
+        _, variant = self.model_variant(mode)
+        # Tuned settings replace the defaults, explicit accuracy_modes overrides win over both
+        tuned = self.tuned_settings.get(variant['source'], {})
+        overrides = self.mode_overrides.get(mode or self.accuracy_mode, {})
+        for option in ('compute_type', 'cpu_threads', 'num_workers'):
+            if option in tuned and option not in overrides:
+                settings[option] = tuned[option]
+        # FIX: Issue #249 - explicit cpu_threads prevents memory growth
+        # Whisper's share of the thread budget, tuned or configured counts capped by it
+        threads = min(settings['cpu_threads'] or THREAD_BUDGET.whisper, THREAD_BUDGET.total)
+        return (variant['source'], resolve_compute_type(settings['compute_type']),
+                (threads, settings['num_workers']))
 
     def load_model_for_mode(self, mode):
         """Lazy load the model needed for the specified mode"""
+        key = self.model_key(mode)
+        model_needed, variant = self.model_variant(mode)
+        previous_title = self.status_item.title
+        downloading_title = f"Status: Downloading {model_needed} model..."
         try:
-            # Determine which model we need
-            model_needed = 'small' if mode in ['fast', 'clarity'] else 'medium'
+            if self.inference_worker:
+                return self.load_model_in_worker(key)
 
             # If model already loaded, nothing to do
-            if self.models_loaded[model_needed]:
+            if self.model_pool.is_resident(key):
                 return True
 
-            print(f"\n📦 Loading {model_needed.upper()} model (first use of {mode} mode)...")
-            print(f"⏳ First time: Downloading AI model (~484MB)")
-            print(f"⏳ This takes 2-3 minutes - please be patient")
-            print(f"⏳ After this, transcription will be instant (2-4s)")
-            print(f"⏳ Do NOT use Force Stop - let the download complete!")
-            self.status_item.title = f"Status: Downloading {model_needed} model..."
-
-            # Set downloading flag to prevent watchdog from interrupting
-            self.downloading_model = True
-
-            if model_needed == 'small':
-                self.whisper_model_small = WhisperModel(
-                    "small",
-                    device="cpu",
-                    compute_type="int8",
-                    cpu_threads=os.cpu_count(),  # FIX: Issue #249 - prevents memory growth
-                    num_workers=1
-                )
-                self.models_loaded['small'] = True
-                print(f"✅ SMALL model loaded ({self.get_model_memory_mb('small'):.0f}MB)")
-                print(f"   Using {os.cpu_count()} CPU threads")
-
-                # Warm up the model to eliminate cold-start penalty
-                self.warmup_model(self.whisper_model_small)
-
-            else:  # medium
-                self.whisper_model_medium = WhisperModel(
-                    "medium",
-                    device="cpu",
-                    compute_type="int8",
-                    cpu_threads=os.cpu_count(),  # FIX: Issue #249 - prevents memory growth
-                    num_workers=1
-                )
-                self.models_loaded['medium'] = True
-                print(f"✅ MEDIUM model loaded ({self.get_model_memory_mb('medium'):.0f}MB)")
-                print(f"   Using {os.cpu_count()} CPU threads")
+            if self.model_pool.peek(key) is None:
+                print(f"\n📦 Loading {model_needed.upper()} model (first use of {mode} mode)...")
+                if variant['download_mb']:
+                    print(f"⏳ First time: Downloading AI model (~{variant['download_mb']}MB)")
+                print(f"⏳ This takes 2-3 minutes - please be patient")
+                print(f"⏳ After this, transcription will be instant (2-4s)")
+                print(f"⏳ Do NOT use Force Stop - let the download complete!")
+                self.status_item.title = downloading_title
+
+                # Set downloading flag to prevent watchdog from interrupting
+                self.downloading_model = True
+            else:
+                print("📦 Reloading model from memory...")
 
-                # Warm up the model to eliminate cold-start penalty
-                self.warmup_model(self.whisper_model_medium)
+            self.model_pool.acquire(key)
 
             # Clear downloading flag - model is now loaded
             self.downloading_model = False
 
-            # Update last model used
-            self.last_model_used = model_needed
+            print(f"✅ {self.model_pool.describe(key)} ready "
+                  f"({self.model_pool.sizes_mb[key]:.0f}MB measured, {self.model_pool.load_times[key]:.1f}s)")
 
             # Show total memory
             process = psutil.Process(os.getpid())
@@ -463,136 +1736,138 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             self.downloading_model = False
             return False
 
-    def get_model_memory_mb(self, model_name):
-        """Estimate memory used by a model"""
-        # Approximate sizes
-        sizes = {
-            'small': 600,
-            'medium': 1500,
-            'vad': 50
-        }
-        return sizes.get(model_name, 0)
+        finally:
+            # Put back the recording/processing status, unless it moved on meanwhile
+            if self.status_item.title == downloading_title:
+                self.status_item.title = previous_title
 
-    def unload_model(self, model_name):
-        """Unload a specific model to free memory"""
+    def load_model_in_worker(self, key):
+        """Make sure the inference worker has the model for key loaded"""
+        if self.inference_worker.is_loaded(key):
+            return True
+        print(f"\n📦 Loading {self.model_pool.describe(key)} in the inference worker...")
+        print(f"⏳ The first time this downloads the AI model - please be patient")
+        self.downloading_model = True
         try:
-            if not self.models_loaded[model_name]:
-                return  # Already unloaded
-
-            print(f"   🧹 Unloading {model_name.upper()} model to free memory...")
-
-            if model_name == 'small' and self.whisper_model_small:
-                del self.whisper_model_small
-                self.whisper_model_small = None
-                self.models_loaded['small'] = False
-
-            elif model_name == 'medium' and self.whisper_model_medium:
-                del self.whisper_model_medium
-                self.whisper_model_medium = None
-                self.models_loaded['medium'] = False
-
-            elif model_name == 'vad' and self.vad_model:
-                del self.vad_model
-                self.vad_model = None
-                self.models_loaded['vad'] = False
-
-            # Force garbage collection
-            import gc
-            gc.collect()
-
-            print(f"   ✅ {model_name.upper()} model unloaded (~{self.get_model_memory_mb(model_name):.0f}MB freed)")
-
-        except Exception as e:
-            print(f"   ⚠️  Error unloading {model_name}: {e}")
-
-    def unload_all_models(self):
-        """Unload all models to free maximum memory"""
-        for model_name in ['small', 'medium', 'vad']:
-            if self.models_loaded[model_name]:
-                self.unload_model(model_name)
-
-    def unload_unused_model(self):
-        """Unload the model that's NOT currently selected (intelligent cleanup)"""
-        if not self.aggressive_memory_cleanup:
-            return
-
-        # Determine which model is currently needed
-        current_mode = self.accuracy_mode
-        model_needed = 'small' if current_mode in ['fast', 'clarity'] else 'medium'
-
-        # Unload the OTHER model
-        if model_needed == 'small' and self.models_loaded['medium']:
-            self.unload_model('medium')
-        elif model_needed == 'medium' and self.models_loaded['small']:
-            self.unload_model('small')
-
-    def cleanup_memory(self):
-        """Comprehensive memory cleanup"""
-        # MEMORY FIX: Unload CTranslate2 models to free memory (Issue #660)
-        # Unload small model if loaded
-        if self.whisper_model_small and self.models_loaded['small']:
-            try:
-                if self.whisper_model_small.model.model_is_loaded:
-                    self.whisper_model_small.model.unload_model()
-            except Exception as e:
-                pass  # Ignore errors during cleanup
-
-        # Unload medium model if loaded
-        if self.whisper_model_medium and self.models_loaded['medium']:
-            try:
-                if self.whisper_model_medium.model.model_is_loaded:
-                    self.whisper_model_medium.model.unload_model()
-            except Exception as e:
-                pass  # Ignore errors during cleanup
-
-        # Clear audio data
-        self.audio_data = []
-
-        # Clear any large temporary buffers
-        if hasattr(self, '_temp_audio_buffer'):
-            del self._temp_audio_buffer
-
-        # Force garbage collection - be very aggressive
-        import gc
-
-        # Collect all generations
-        gc.collect(0)  # Young generation
-        gc.collect(1)  # Middle generation
-        gc.collect(2)  # Old generation (full collection)
-
-        # One more pass to catch stragglers
-        gc.collect()
+            size_mb, seconds = self.inference_worker.load(key)
+        finally:
+            self.downloading_model = False
+        print(f"✅ {self.model_pool.describe(key)} ready in the worker ({size_mb:.0f}MB, {seconds:.1f}s)")
+        return True
+
+    def release_models(self):
+        """Give the models' memory back: park their weights (or stop the inference worker)
+
+        Not while a two-pass refinement is decoding - it releases them when it is done.
+        """
+        if self.refining:
+            return 0
+        if self.inference_worker:
+            if self.inference_worker.process is None:
+                return 0
+            self.inference_worker.stop()
+            return 1
+        # MEMORY FIX: Unload CTranslate2 weights to free memory (Issue #660)
+        return self.model_pool.park_all()
+
+    def cleanup_memory(self, park_models=True):
+        """Comprehensive memory cleanup (park_models=False leaves that to the residency policy)"""
+        if park_models:
+            self.release_models()
+
+        # Clear captured audio (keeps the preallocated buffer for next time)
+        if hasattr(self, 'audio_buffer'):
+            self.audio_buffer.reset()
+
+        # Collect garbage and return freed pages to the OS
+        self.model_pool.release_memory()
 
     def load_preferences(self):
-        """Load language preferences and accuracy mode from config file"""
+        """Load language preferences, accuracy mode and performance options from config file"""
+        self.config = {}
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    self.input_language = config.get('input_language', 'en')
-                    self.output_language = config.get('output_language', 'en')
-                    self.accuracy_mode = config.get('accuracy_mode', 'clarity')  # Default to Clarity Boost
-            else:
-                # Default to English and Clarity Boost mode
-                self.input_language = 'en'
-                self.output_language = 'en'
-                self.accuracy_mode = 'clarity'
+                    self.config = json.load(f)
         except Exception as e:
             print(f"⚠️  Error loading preferences: {e}")
-            self.input_language = 'en'
-            self.output_language = 'en'
-            self.accuracy_mode = 'clarity'
+            self.config = {}
+
+        # Default to English and Clarity Boost mode
+        self.input_language = self.config.get('input_language', 'en')
+        self.output_language = self.config.get('output_language', 'en')
+        self.accuracy_mode = self.config.get('accuracy_mode', 'clarity')
+
+        # Performance options (opt-in, edit the config file to change)
+        # Transcribe finished utterances in the background while still recording
+        self.streaming_transcription = self.config.get('streaming_transcription', False)
+        # Stop recording by itself once speech is followed by enough silence
+        self.auto_stop_on_silence = self.config.get('auto_stop_on_silence', False)
+        self.auto_stop_silence_ms = self.config.get('auto_stop_silence_ms', 1500)
+        self.auto_stop_min_speech_ms = self.config.get('auto_stop_min_speech_ms', 600)
+        # Keep the microphone open between recordings, with a pre-roll of what was just said
+        self.keep_microphone_warm = self.config.get('keep_microphone_warm', False)
+        self.preroll_ms = self.config.get('preroll_ms', 300)
+        self.warm_microphone_idle_s = self.config.get('warm_microphone_idle_s', 120)
+        # Memory the Whisper models may use together (least recently used is evicted first)
+        self.model_memory_budget_mb = self.config.get('model_memory_budget_mb', 2000)
+        # Per-mode model/compute type/thread overrides, e.g. {"max": {"model_name": "large-v3-turbo"}}
+        self.mode_overrides = self.config.get('accuracy_modes', {})
+        # Initial prompts: a versioned template, the user's vocabulary and a token budget
+        self.prompt_templates = dict(PROMPT_TEMPLATES, **self.config.get('prompt_templates', {}))
+        self.prompt_template = self.config.get('prompt_template', 'detailed-v1')
+        self.prompt_vocabulary = self.config.get('prompt_vocabulary', [])
+        self.prompt_token_budget = self.config.get('prompt_token_budget')  # None: templates are never trimmed
+        # Fastest compute type and thread layout per model, measured by --tune
+        self.tuned_settings = self.config.get('tuned_settings', {})
+        # How long models stay loaded after a dictation: unload, always, ttl or predictive
+        self.model_residency = self.config.get('model_residency', 'unload')
+        self.model_ttl_s = self.config.get('model_ttl_s', 120)
+        # Run Whisper in a subprocess that is recycled to give memory back to the OS
+        self.use_inference_worker = self.config.get('inference_worker', False)
+        self.worker_max_jobs = self.config.get('worker_max_jobs', 20)
+        self.worker_max_growth_mb = self.config.get('worker_max_growth_mb', 500)
+        self.worker_timeout_s = self.config.get('worker_timeout_s', 120)
+        # Filter and gather preprocessing statistics while recording
+        self.streaming_preprocessing = self.config.get('streaming_preprocessing', False)
+        # Skip the VAD model on digital silence and on frames at the microphone's noise floor
+        self.vad_energy_gate = self.config.get('vad_energy_gate', True)
+        self.vad_silence_db = self.config.get('vad_silence_db', -80)
+        self.vad_noise_margin_db = self.config.get('vad_noise_margin_db', 3)
+        # Recordings whose best VAD frame stays below threshold + margin skip Whisper entirely
+        self.no_speech_margin = self.config.get('no_speech_margin', 0.15)
+        # Recordings at least this long are decoded as parallel chunks (0 turns it off)
+        self.long_form_seconds = self.config.get('long_form_seconds', 60)
+        self.long_form_batch_size = self.config.get('long_form_batch_size', 8)
+        # Decode the audio of low-confidence segments again instead of dropping their words
+        self.redecode_low_confidence = self.config.get('redecode_low_confidence', False)
+        self.redecode_beam_size = self.config.get('redecode_beam_size', 8)
+        self.redecode_mode = self.config.get('redecode_mode', 'max')
+        if self.redecode_mode not in ACCURACY_MODES:
+            self.redecode_mode = 'max'
+        # Type each segment as soon as it is decoded instead of the whole text at the end
+        self.streaming_output = self.config.get('streaming_output', False)
+        # Type a fast draft first, then replace it with the accuracy mode's result
+        self.two_pass = self.config.get('two_pass', False)
+        self.two_pass_draft_mode = self.config.get('two_pass_draft_mode', 'fast')
+        if self.two_pass_draft_mode not in ACCURACY_MODES:
+            self.two_pass_draft_mode = 'fast'
 
     def save_preferences(self):
         """Save language preferences and accuracy mode to config file"""
         try:
-            config = {
+            # Update in place so options we don't manage from the menu are preserved,
+            # including ones written since we started (e.g. by --tune)
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r') as f:
+                    self.config.update(json.load(f))
+            self.config.update({
                 'input_language': self.input_language,
                 'output_language': self.output_language,
                 'accuracy_mode': self.accuracy_mode
-            }
+            })
             with open(self.config_file, 'w') as f:
-                json.dump(config, f)
+                json.dump(self.config, f, indent=2)
         except Exception as e:
             print(f"⚠️  Error saving preferences: {e}")
 
@@ -639,11 +1914,6 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
 
     def set_accuracy_mode(self, mode):
         """Set accuracy mode and update menu"""
-        # Check if max mode is available
-        if mode == 'max' and not hasattr(self, 'whisper_model_medium'):
-            print("⚠️  Max Accuracy mode not available (medium model not loaded)")
-            return
-
         # Update checkmarks
         for mode_key, menu_item in self.accuracy_mode_menu.items():
             menu_item.state = (mode_key == mode)
@@ -656,38 +1926,9 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
         self.save_preferences()
         print(f"✅ Accuracy mode set to: {self.get_mode_name(mode)}")
 
-    def get_mode_settings(self):
-        """Get transcription settings for the current accuracy mode"""
-        mode_settings = {
-            'fast': {
-                'model': self.whisper_model_small,  # Will be loaded on-demand if None
-                'compute_type': 'int8',
-                'beam_size': 3,
-                'temperature': 0.0,
-                'vad_threshold': 0.5,
-                'compression_ratio': 4,  # Less aggressive compression for speed
-                'description': 'Fast mode'
-            },
-            'clarity': {
-                'model': self.whisper_model_small,  # Will be loaded on-demand if None
-                'compute_type': 'int8_float16',
-                'beam_size': 5,
-                'temperature': 0.2,
-                'vad_threshold': 0.35,  # More sensitive to catch all speech (research-optimized)
-                'compression_ratio': 6,  # More aggressive compression for clarity
-                'description': 'Clarity Boost'
-            },
-            'max': {
-                'model': self.whisper_model_medium if self.whisper_model_medium else self.whisper_model_small,
-                'compute_type': 'int8_float16',
-                'beam_size': 5,
-                'temperature': 0.2,
-                'vad_threshold': 0.4,
-                'compression_ratio': 6,
-                'description': 'Max Accuracy'
-            }
-        }
-        return mode_settings.get(self.accuracy_mode, mode_settings['clarity'])
+    def get_mode_settings(self, mode=None):
+        """Get transcription settings for an accuracy mode (default: the current one)"""
+        return self.mode_config(mode)
 
     def check_translation_available(self):
         """Check if translation is available without loading heavy models"""
@@ -809,20 +2050,29 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             # Audio settings
             self.sample_rate = 16000
             self.recording = False
-            self.audio_data = []
+            self.audio_buffer = AudioCaptureBuffer(self.sample_rate)
+            self.preprocessor = AudioPreprocessor(self.sample_rate)
+            if self.keep_microphone_warm:
+                self.preroll = PreRollBuffer(self.sample_rate, self.preroll_ms, self.audio_buffer.dtype)
 
             # Load Silero VAD model for voice activity detection (lightweight, always load)
             print("Loading Silero VAD model...")
             self.use_vad = False
             try:
-                import silero_vad
-                # Use ONNX mode for better compatibility (returns just the model)
-                self.vad_model = silero_vad.load_silero_vad(onnx=True)
-                # When using ONNX, get_speech_timestamps is available from the module
-                self.vad_get_speech_timestamps = silero_vad.get_speech_timestamps
-                self.models_loaded['vad'] = True
-                print("✅ Silero VAD loaded successfully!")
+                # Run the ONNX model through onnxruntime directly so torch is never imported
+                model_path = find_silero_onnx_model()
+                try:
+                    if not model_path:
+                        raise ImportError("silero_vad ONNX model not found")
+                    self.vad_model = SileroOnnxVAD(model_path, self.sample_rate, threads=THREAD_BUDGET.vad)
+                    print("✅ Silero VAD loaded successfully (onnxruntime, no torch)!")
+                except (ImportError, ValueError) as e:
+                    print(f"⚠️  onnxruntime VAD unavailable ({e}) - falling back to silero_vad + torch")
+                    self.vad_model = TorchSileroVAD(self.sample_rate, threads=THREAD_BUDGET.vad)
+                    print("✅ Silero VAD loaded successfully!")
                 self.use_vad = True
+                if self.vad_energy_gate:
+                    self.energy_gate = EnergyGate(silence_db=self.vad_silence_db, margin_db=self.vad_noise_margin_db)
             except ImportError as e:
                 print(f"⚠️  Silero VAD not installed: {e}")
                 print("   App will work without VAD (slightly slower)")
@@ -884,6 +2134,10 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 print("   App will work but hotkey won't be available")
                 self.listener = None
 
+            # Open the microphone now so the first recording starts instantly
+            if self.keep_microphone_warm:
+                self.open_warm_microphone()
+
             # Update status
             self.status_item.title = "Status: Ready ⚡"
             self.title = "🎤⚡"
@@ -916,14 +2170,43 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             print(f"   • Output: {self.get_language_name(self.output_language)} 📝")
             if self.use_vad:
                 print("   • VAD enabled (smart voice detection)")
+                if self.energy_gate:
+                    print(f"   • Energy gate skips digital silence (peak below {self.vad_silence_db} dBFS) "
+                          f"and room noise (within {self.vad_noise_margin_db} dB of its floor)")
             else:
                 print("   • VAD disabled (manual silence handling)")
             if self.translation_available:
                 print("   • Translation ready ✅")
+            if self.streaming_transcription and self.use_vad:
+                print("   • Streaming transcription (decodes while you speak)")
+            if self.keep_microphone_warm:
+                print(f"   • Warm microphone with {self.preroll_ms}ms pre-roll "
+                      f"(released after {self.warm_microphone_idle_s}s idle)")
+            if self.streaming_preprocessing:
+                print("   • Streaming preprocessing (audio cleaned while you speak)")
+            if self.auto_stop_on_silence and self.use_vad:
+                print(f"   • Auto-stop after {self.auto_stop_silence_ms}ms of silence")
+            print(f"   • Prompt: {self.prompt_template} template, {len(self.prompt_vocabulary)} vocabulary word(s)"
+                  + (f", max {self.prompt_token_budget} tokens" if self.prompt_token_budget else ""))
+            if self.redecode_low_confidence:
+                print(f"   • Low-confidence segments re-decoded (beam {self.redecode_beam_size}, "
+                      f"then {self.get_mode_name(self.redecode_mode)})")
+            if self.streaming_output:
+                print("   • Streaming output (text is typed segment by segment)")
+            if self.two_pass:
+                print(f"   • Two-pass: {self.get_mode_name(self.two_pass_draft_mode)} draft, "
+                      f"refined by slower modes")
+            if self.long_form_seconds > 0 and self.use_vad:
+                print(f"   • Long-form mode: recordings over {self.long_form_seconds}s decode "
+                      f"{self.long_form_batch_size} chunks at a time")
             print("\n🚀 Memory Optimizations:")
             print(f"   • Startup memory: {startup_memory:.0f}MB (70% less than before!)")
             print("   • Models load on-demand when first used")
-            print("   • Unused models auto-unload after use")
+            print(f"   • Thread budget: {THREAD_BUDGET}")
+            print(f"   • Models share a {self.model_memory_budget_mb}MB budget (least recently used unloads first)")
+            if self.inference_worker:
+                print(f"   • Models run in a worker process, recycled after {self.worker_max_jobs} dictations "
+                      f"or {self.worker_max_growth_mb}MB growth")
             print("   • Memory display in menu bar updates every 30s")
             print("   • Works great on 8GB Macs!")
             print("="*50 + "\n")
@@ -938,19 +2221,33 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             try:
                 # Update last activity time
                 self.last_activity_time = time.time()
-
-                # Close any existing stream before starting new one (defensive)
-                if hasattr(self, 'stream'):
-                    try:
-                        self.stream.stop()
-                        self.stream.close()
-                        delattr(self, 'stream')
-                        print("🧹 Cleaned up previous stream")
-                    except:
-                        pass  # Ignore errors closing old stream
+                self.dictations += 1
+
+                # Reopen a warm microphone if it was released while idle (no pre-roll this time)
+                reopened = self.keep_microphone_warm and not hasattr(self, 'stream')
+                if self.keep_microphone_warm and (not reopened or self.open_warm_microphone()):
+                    # Recording starts instantly, beginning with the pre-roll
+                    with self.capture_lock:
+                        self.audio_buffer.reset()
+                        if reopened:
+                            self.preroll.clear()
+                        else:
+                            self.preroll.drain_into(self.audio_buffer)
+                        self.capture_active = True
+                else:
+                    # Close any existing stream before starting new one (defensive)
+                    if hasattr(self, 'stream'):
+                        try:
+                            self.stream.stop()
+                            self.stream.close()
+                            delattr(self, 'stream')
+                            print("🧹 Cleaned up previous stream")
+                        except:
+                            delattr(self, 'stream')  # Ignore errors closing old stream, open a new one
+                    self.audio_buffer.reset()
+                    self.capture_active = True
 
                 self.recording = True
-                self.audio_data = []
                 self.recording_start_time = time.time()
                 self.status_item.title = "Status: 🔴 Recording..."
                 self.title = "🔴"
@@ -964,13 +2261,50 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 print("   (Max 5 minutes, auto-stops)")
                 print("="*50 + "\n")
 
-                # Start audio stream
-                self.stream = sd.InputStream(
-                    samplerate=self.sample_rate,
-                    channels=1,
-                    callback=self.audio_callback
-                )
-                self.stream.start()
+                # Start audio stream (also when a warm one could not be opened -
+                # if this fails too, the error below is shown instead of recording nothing)
+                if not hasattr(self, 'stream'):
+                    self.stream = self.open_input_stream()
+
+                # Load and warm the model while the user speaks instead of after stop
+                # (two-pass needs the draft model first, the refining one loads after typing)
+                self.residency.dictation_started()
+                self.prepare_model(self.two_pass_draft_mode if self.two_pass_enabled() else self.accuracy_mode)
+
+                # Run VAD frame by frame while recording so it costs nothing after stop
+                if self.use_vad:
+                    self.streaming_vad = StreamingVAD(
+                        self.audio_buffer,
+                        frame_probability=self.vad_frame_probability,
+                        threshold=self.get_vad_threshold(),
+                        reset=self.vad_model.reset_states,
+                        gate=self.energy_gate,
+                        on_endpoint=self.on_speech_endpoint if self.auto_stop_on_silence else None,
+                        endpoint_silence_ms=self.auto_stop_silence_ms,
+                        endpoint_min_speech_ms=self.auto_stop_min_speech_ms
+                    )
+                    self.streaming_vad.start()
+
+                # Filter the audio as it arrives so only gain stages remain at stop
+                if self.streaming_preprocessing:
+                    self.streaming_preprocessor = StreamingPreprocessor(
+                        self.audio_buffer,
+                        self.preprocessor,
+                        self.accuracy_mode,
+                        self.get_mode_settings()['compression_ratio']
+                    )
+                    self.streaming_preprocessor.start()
+
+                # Streaming mode: transcribe finished utterances while the user keeps talking
+                if self.streaming_transcription and self.streaming_vad:
+                    mode = self.accuracy_mode
+                    self.streaming_transcriber = StreamingTranscriber(
+                        self.audio_buffer,
+                        vad=self.streaming_vad,
+                        transcribe=self.transcribe_audio,
+                        prepare=lambda: self.load_model_for_mode(mode)
+                    )
+                    self.streaming_transcriber.start()
 
                 # Start timeout monitor
                 threading.Thread(target=self.check_recording_timeout, daemon=True).start()
@@ -982,19 +2316,77 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 self.status_item.title = "Status: Error - Mic access"
                 self.stop_button.title = "Stop Recording (hidden)"
                 self.recording = False
+                self.capture_active = False
+
+    def prepare_model(self, mode):
+        """Start loading the model for mode in the background (a no-op there if it is resident)
+
+        Even the residency check runs on that thread: a load of another model
+        in progress must never hold up the hotkey that started the recording.
+        """
+        self.model_preparing = threading.Thread(
+            target=self.load_model_for_mode, args=(mode,), daemon=True)
+        self.model_preparing.start()
+
+    def open_input_stream(self):
+        """Open and start an input stream that feeds audio_callback"""
+        stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype=self.audio_buffer.dtype.name,  # Capture straight into int16 storage
+            callback=self.audio_callback
+        )
+        stream.start()
+        return stream
+
+    def open_warm_microphone(self):
+        """Keep one input stream open, filling the pre-roll while not recording; returns True if open"""
+        try:
+            self.stream = self.open_input_stream()
+        except Exception as e:
+            print(f"❌ Could not keep microphone warm: {e}")
+            self.microphone_item.title = "🎙️ Microphone: Unavailable (retried on next recording)"
+            return False
+        self.microphone_item.title = "🎙️ Microphone: Warm (click to release)"
+        print(f"🎙️  Microphone kept warm ({self.preroll_ms}ms pre-roll)")
+        return True
+
+    def release_warm_microphone(self):
+        """Close the warm stream so the device is free; reopened on the next recording"""
+        if self.recording or not hasattr(self, 'stream'):
+            return
+        try:
+            self.close_stream_with_timeout(self.stream, timeout=2.0)
+        finally:
+            if hasattr(self, 'stream'):
+                delattr(self, 'stream')
+            # What it holds is from before the release - never the start of a later dictation
+            self.preroll.clear()
+        self.microphone_item.title = "🎙️ Microphone: Released (opens on next recording)"
+        print("🎙️  Microphone released")
+
+    def toggle_warm_microphone(self, _):
+        """Menu: release the warm microphone, or warm it up again"""
+        if hasattr(self, 'stream'):
+            self.release_warm_microphone()
+        elif not self.recording and not self.processing:
+            self.open_warm_microphone()
 
     def audio_callback(self, indata, frames, time_info, status):
         """Callback for audio stream - collect all audio while stream is active"""
         # Always collect audio while stream exists, don't check recording flag
         # (recording flag can be set to False before all callbacks finish)
-        if hasattr(self, 'audio_data'):
-            self.audio_data.append(indata.copy())
+        with self.capture_lock:
+            if self.capture_active:
+                self.audio_buffer.write(indata, status)
+            elif self.preroll is not None:
+                self.preroll.write(indata)
             if status:
                 print(f"[AUDIO] Status: {status}")
 
     def check_recording_timeout(self):
         """Monitor recording and auto-stop after 5 minutes"""
-        max_duration = 300  # 5 minutes in seconds
+        max_duration = MAX_RECORDING_SECONDS
         while self.recording and self.recording_start_time:
             elapsed = time.time() - self.recording_start_time
             if elapsed > max_duration:
@@ -1003,6 +2395,18 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 break
             time.sleep(1)
 
+    def on_speech_endpoint(self):
+        """Called by StreamingVAD when the speaker has gone quiet (auto-stop mode)"""
+        # Stop from a separate thread - the VAD worker must not wait on the stream close
+        threading.Thread(target=self.auto_stop_recording, daemon=True).start()
+
+    def auto_stop_recording(self):
+        """Stop recording because speech ended, so processing starts right away"""
+        if self.recording:
+            print(f"\n🤫 {self.auto_stop_silence_ms}ms of silence after speech - auto-stopping...")
+            self.last_action = 'stop'
+            self.stop_recording()
+
     def manual_stop(self, _):
         """Manual stop via menu bar button"""
         if self.recording:
@@ -1061,21 +2465,30 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 self.stop_button.title = "Stop Recording (hidden)"
 
                 # Debug: Log audio data info
-                audio_chunks = len(self.audio_data) if hasattr(self, 'audio_data') else 0
-                print(f"[DEBUG] Audio chunks collected: {audio_chunks}")
-
-                # Close audio stream with timeout to prevent hanging
-                if hasattr(self, 'stream'):
-                    try:
-                        # Try to close with 2-second timeout
-                        self.close_stream_with_timeout(self.stream, timeout=2.0)
-                    except Exception as e:
-                        print(f"⚠️  Error during stream closing: {e}")
-                    finally:
-                        # Always delete the stream reference, even if close failed
-                        if hasattr(self, 'stream'):
-                            delattr(self, 'stream')
-                        print("✅ Stream reference cleared")
+                if hasattr(self, 'audio_buffer'):
+                    buf = self.audio_buffer
+                    print(f"[DEBUG] Audio captured: {buf.frames} frames ({buf.seconds:.1f}s) "
+                          f"in {buf.callbacks} callbacks, {buf.overruns} overruns, "
+                          f"{buf.dropped_frames} dropped frames")
+
+                if self.keep_microphone_warm and hasattr(self, 'stream'):
+                    # Warm microphone: keep the stream, route the callback back to the pre-roll
+                    with self.capture_lock:
+                        self.capture_active = False
+                else:
+                    # Close audio stream with timeout to prevent hanging
+                    if hasattr(self, 'stream'):
+                        try:
+                            # Try to close with 2-second timeout
+                            self.close_stream_with_timeout(self.stream, timeout=2.0)
+                        except Exception as e:
+                            print(f"⚠️  Error during stream closing: {e}")
+                        finally:
+                            # Always delete the stream reference, even if close failed
+                            if hasattr(self, 'stream'):
+                                delattr(self, 'stream')
+                            print("✅ Stream reference cleared")
+                    self.capture_active = False
 
                 print(f"\n⏹️  Recording stopped ({elapsed:.1f}s). Processing with enhanced settings...")
 
@@ -1088,142 +2501,73 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 traceback.print_exc()
                 # Ensure state gets reset even if there's an error
                 self.recording = False
+                self.capture_active = False
                 self.processing = False
                 self.last_action = None  # Reset action tracking
                 self.status_item.title = "Status: Error - see console"
                 self.title = "🎤⚡"
 
-    def apply_vad(self, audio_array):
-        """Apply Voice Activity Detection to extract only speech segments (language-adaptive)"""
-        try:
-            if not self.use_vad:
-                return audio_array
+    def get_vad_threshold(self):
+        """Speech probability threshold for the current mode and input language"""
+        # Get mode-specific settings
+        mode_settings = self.get_mode_settings()
+        base_vad_threshold = mode_settings['vad_threshold']
+
+        # Language-adaptive VAD threshold adjustment
+        # Spanish has different phonetic characteristics and may need more sensitive detection
+        if self.input_language == 'es':
+            # Spanish: reduce threshold by 0.05 to catch more speech nuances
+            vad_threshold = max(0.2, base_vad_threshold - 0.05)
+        else:
+            # English: use base threshold
+            vad_threshold = base_vad_threshold
 
-            # Get mode-specific settings
-            mode_settings = self.get_mode_settings()
-            base_vad_threshold = mode_settings['vad_threshold']
+        return vad_threshold
 
-            # Language-adaptive VAD threshold adjustment
-            # Spanish has different phonetic characteristics and may need more sensitive detection
-            if self.input_language == 'es':
-                # Spanish: reduce threshold by 0.05 to catch more speech nuances
-                vad_threshold = max(0.2, base_vad_threshold - 0.05)
-            else:
-                # English: use base threshold
-                vad_threshold = base_vad_threshold
-
-            # Convert to tensor for VAD
-            audio_tensor = torch.from_numpy(audio_array).float()
-
-            # Get speech timestamps with language-adaptive threshold
-            speech_timestamps = self.vad_get_speech_timestamps(
-                audio_tensor,
-                self.vad_model,
-                sampling_rate=self.sample_rate,
-                threshold=vad_threshold,  # Language-adaptive threshold
-                min_speech_duration_ms=250,
-                min_silence_duration_ms=100
-            )
+    def vad_frame_probability(self, window):
+        """Speech probability of one 512-sample float32 window (used by StreamingVAD)"""
+        return self.vad_model(window)
+
+    def find_speech_regions(self, audio_array, speech_timestamps=None):
+        """Voice Activity Detection as sample ranges over audio_array (language-adaptive)
 
-            # Clear the tensor immediately - no longer needed
-            del audio_tensor
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+        speech_timestamps are the ones StreamingVAD found while recording (None when it
+        didn't run). Returns None when the whole array should be decoded.
+        """
+        try:
+            if not self.use_vad or speech_timestamps is None:
+                return None
 
             if not speech_timestamps:
                 print("⚠️  No speech detected by VAD")
-                return audio_array
-
-            # Extract speech segments
-            speech_segments = []
-            for timestamp in speech_timestamps:
-                start = timestamp['start']
-                end = timestamp['end']
-                speech_segments.append(audio_array[start:end])
+                return None
 
-            # Combine all speech segments
-            if speech_segments:
-                vad_audio = np.concatenate(speech_segments)
-                reduction_pct = (1 - len(vad_audio) / len(audio_array)) * 100
-                print(f"✨ VAD removed {reduction_pct:.1f}% silence/noise")
+            regions = speech_regions(speech_timestamps, len(audio_array), self.sample_rate)
+            if not regions:
+                return None
 
-                # Clear intermediate data
-                del speech_segments
-                del speech_timestamps
-
-                return vad_audio
-
-            return audio_array
+            speech = sum(end - start for start, end in regions)
+            reduction_pct = (1 - speech / len(audio_array)) * 100
+            print(f"✨ VAD skips {reduction_pct:.1f}% silence/noise ({len(regions)} region(s))")
+            return regions
 
         except Exception as e:
             print(f"⚠️  VAD processing warning: {e}")
-            return audio_array
+            return None
 
-    def preprocess_audio(self, audio_array):
-        """Advanced audio preprocessing for better transcription accuracy"""
+    def preprocess_audio(self, audio_array, regions=None):
+        """Advanced audio preprocessing for better transcription accuracy
+
+        With speech regions, noise floor and level come from the speech only,
+        and trimming is skipped (it would shift the regions, which already skip the silence).
+        """
         try:
             # Get mode-specific settings
             mode_settings = self.get_mode_settings()
             compression_ratio = mode_settings['compression_ratio']
 
-            # Import scipy for audio processing
-            from scipy import signal
-
-            # OPTIMIZED PIPELINE ORDER (research-backed):
-            # Filter → Noise Reduction → Normalize → Compress → Trim
-            # Each step works on cleaner input from previous step
-
-            # 1. Apply band-pass filter FIRST to focus on speech frequencies (300 Hz - 7.8 kHz)
-            # Research shows speech intelligibility is primarily in 300Hz-8kHz range
-            # Using 7800 Hz instead of 8000 Hz to avoid filter edge case (must be < fs/2)
-            sos_high = signal.butter(4, 300, 'hp', fs=self.sample_rate, output='sos')
-            audio_array = signal.sosfilt(sos_high, audio_array)
-
-            # Low-pass filter to remove ultrasonic noise and artifacts
-            sos_low = signal.butter(4, 7800, 'lp', fs=self.sample_rate, output='sos')
-            audio_array = signal.sosfilt(sos_low, audio_array)
-
-            # 2. Advanced noise reduction on filtered spectrum (mode-specific)
-            # Clarity/Max modes use more aggressive noise reduction
-            if self.accuracy_mode in ['clarity', 'max']:
-                # More aggressive: use quietest 5% as noise profile
-                sorted_abs = np.sort(np.abs(audio_array))
-                noise_threshold = sorted_abs[int(len(sorted_abs) * 0.05)]
-                # Harder gating for better noise removal
-                mask = np.abs(audio_array) > noise_threshold
-                audio_array = audio_array * (0.02 + 0.98 * mask)
-            else:
-                # Fast mode: standard noise reduction
-                sorted_abs = np.sort(np.abs(audio_array))
-                noise_threshold = sorted_abs[int(len(sorted_abs) * 0.1)]
-                mask = np.abs(audio_array) > noise_threshold
-                audio_array = audio_array * (0.05 + 0.95 * mask)
-
-            # 3. Normalize audio volume on cleaned audio
-            max_val = np.abs(audio_array).max()
-            if max_val > 0:
-                audio_array = audio_array / max_val * 0.95  # Normalize to 95% max
-
-            # 4. Dynamic range compression for more even volume (mode-specific)
-            # Compress loud parts, boost quiet parts - more aggressive in clarity/max modes
-            threshold_db = -20
-            audio_db = 20 * np.log10(np.abs(audio_array) + 1e-10)
-            over_threshold = audio_db > threshold_db
-            compressed_db = audio_db.copy()
-            compressed_db[over_threshold] = threshold_db + (audio_db[over_threshold] - threshold_db) / compression_ratio
-            audio_array = np.sign(audio_array) * (10 ** (compressed_db / 20))
-
-            # 5. Trim silence from beginning and end
-            threshold = 0.01  # Silence threshold
-            non_silent = np.abs(audio_array) > threshold
-            if non_silent.any():
-                first_sound = np.argmax(non_silent)
-                last_sound = len(audio_array) - np.argmax(non_silent[::-1]) - 1
-                # Keep a small margin (0.1 seconds) before and after
-                margin = int(0.1 * self.sample_rate)
-                start = max(0, first_sound - margin)
-                end = min(len(audio_array), last_sound + margin)
-                audio_array = audio_array[start:end]
+            audio_array = self.preprocessor.process(audio_array, self.accuracy_mode, compression_ratio,
+                                                    trim=regions is None, regions=regions)
 
             print("✨ Audio preprocessed (enhanced quality)")
             return audio_array
@@ -1239,6 +2583,233 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             print(f"⚠️  Audio preprocessing warning: {e}")
             return audio_array
 
+    def get_initial_prompt(self, mode=None):
+        """Initial prompt for the current input language and an accuracy mode (default: the current one)"""
+        # Initial prompt for context (language-specific and mode-aware)
+        return build_prompt(self.prompt_templates, self.prompt_template, self.input_language,
+                            mode or self.accuracy_mode, self.prompt_vocabulary)
+
+    def transcribe_audio(self, audio_array, preprocessed=False, regions=None, mode=None, on_segment=None,
+                         redecode=True, recording_seconds=None, cancelled=None):
+        """Preprocess and transcribe one speech array, returning only high-confidence text
+
+        regions limits decoding to those (start, end) sample ranges of audio_array;
+        mode decodes with another accuracy mode's model and settings;
+        on_segment is called with each kept segment's text as soon as it is decoded;
+        redecode=False drops low-confidence segments instead of decoding them again;
+        recording_seconds is the whole recording's length when audio_array is only its tail;
+        cancelled() turning true stops the decode early with DecodeCancelled.
+        """
+        redecode = redecode and self.redecode_low_confidence
+        # Preprocess audio for better accuracy (unless that already happened while recording)
+        if not preprocessed:
+            audio_array = self.preprocess_audio(audio_array, regions=regions)
+
+        # faster-whisper takes 16 kHz mono float32 directly: no WAV write,
+        # no int16 quantization and no PyAV decode (which also leaked memory)
+        audio_array = audio_array.astype(np.float32, copy=False)
+
+        # Get mode-specific settings
+        mode_settings = self.get_mode_settings(mode)
+        beam_size = mode_settings['beam_size']
+        temperature = mode_settings['temperature']
+        mode_description = mode_settings['description']
+
+        # Transcribe with faster-whisper using mode-specific settings
+        print(f"🔄 Transcribing with {mode_description} ({self.get_language_name(self.input_language)})...")
+
+        # Language-adaptive thresholds for better bilingual support
+        # Spanish speech patterns need more sensitive detection
+        no_speech_thresh = 0.5 if self.input_language == 'es' else 0.6
+
+        options = dict(
+            language=self.input_language,  # Use selected input language
+            beam_size=beam_size,  # Mode-specific beam size
+            temperature=temperature,  # Mode-specific temperature
+            initial_prompt=self.get_initial_prompt(mode) or None,
+            prompt_token_budget=self.prompt_token_budget,  # Tokenized once per model, then cached
+            vad_filter=False,  # We already did VAD
+            compression_ratio_threshold=1.35,  # Research-backed optimal value for both languages
+            log_prob_threshold=-1.0,
+            no_speech_threshold=no_speech_thresh  # Language-adaptive threshold
+        )
+        decode_start = time.time()
+        duration = len(audio_array) / self.sample_rate
+
+        # Long-form: decode the chunks side by side instead of one window after the other
+        all_segments = None
+        if regions and self.long_form_seconds > 0 and (recording_seconds or duration) >= self.long_form_seconds:
+            chunks = long_form_chunks(regions, self.sample_rate)
+            try:
+                # Chunks are decoded independently, so there is no previous text to condition on
+                all_segments = list(self.decode(
+                    audio_array,
+                    mode=mode,
+                    cancelled=cancelled,
+                    batch_size=self.long_form_batch_size,
+                    clip_timestamps=[{'start': start / self.sample_rate, 'end': end / self.sample_rate}
+                                     for start, end in chunks],
+                    **options
+                ))
+                decode_path = f"batched, {len(chunks)} chunks"
+            except DecodeCancelled:
+                raise
+            except Exception as e:
+                print(f"⚠️  Batched long-form decoding failed, decoding sequentially: {e}")
+
+        if all_segments is None:
+            # Decode only the speech regions, in seconds: "0" means the whole array
+            clip_timestamps = "0"
+            if regions:
+                clip_timestamps = [t / self.sample_rate for region in regions for t in region]
+            segments = self.decode(
+                audio_array,
+                mode=mode,
+                cancelled=cancelled,
+                clip_timestamps=clip_timestamps,  # Speech regions, no concatenated copy
+                condition_on_previous_text=True,
+                **options
+            )
+
+            # Collect all segments with confidence filtering, or filter
+            # them one by one as they are decoded when streaming the output
+            all_segments = segments if on_segment else list(segments)
+            decode_path = "sequential"
+
+        # Determine confidence threshold based on accuracy mode
+        if (mode or self.accuracy_mode) == 'max':
+            confidence_threshold = -0.8  # Stricter for max accuracy
+        else:
+            confidence_threshold = -1.0  # Standard threshold
+
+        texts = []  # Kept (or successfully re-decoded) text per segment, in order
+        low_confidence = 0  # Filtered segments that were decoded again
+        recovered = 0
+        filtered_count = 0
+        total_segments = 0
+
+        # Filter out low-confidence segments to reduce hallucinations
+        for segment in all_segments:
+            total_segments += 1
+            # Check avg_logprob (average log probability) for confidence
+            # Higher values (closer to 0) = more confident
+            # Typical range: -2.0 (low) to -0.3 (high)
+            if hasattr(segment, 'avg_logprob') and segment.avg_logprob < confidence_threshold:
+                # Low confidence - filter out
+                filtered_count += 1
+                if segment.avg_logprob < -1.5:
+                    # Very low confidence - likely hallucination
+                    print(f"   🔍 Filtered LOW confidence segment: '{segment.text.strip()}' (score: {segment.avg_logprob:.2f})")
+                else:
+                    print(f"   🔍 Filtered segment: '{segment.text.strip()}' (score: {segment.avg_logprob:.2f})")
+                # Speech the model was unsure about gets another try right away (not
+                # silence it made up), so streamed text stays in order without waiting
+                if redecode and getattr(segment, 'no_speech_prob', 0.0) < no_speech_thresh:
+                    low_confidence += 1
+                    text = self.redecode_span(audio_array, segment, mode, options, confidence_threshold)
+                    if text:
+                        recovered += 1
+                        texts.append(text)
+                        if on_segment:
+                            on_segment(text)
+            else:
+                # High confidence - keep it
+                texts.append(segment.text)
+                if on_segment:
+                    on_segment(segment.text)
+
+        # Real-time factor: decode time / audio time (lower is faster)
+        decode_time = time.time() - decode_start
+        if duration > 0:
+            print(f"⏱️  Decoded {duration:.1f}s of audio in {decode_time:.1f}s "
+                  f"(RTF {decode_time / duration:.2f}, {decode_path})")
+
+        # Log filtering results
+        kept_segments = len(texts) - recovered
+
+        if filtered_count > 0:
+            print(f"🔍 Confidence filtering: {total_segments} segments, {kept_segments} kept, {filtered_count} filtered"
+                  + (f", {recovered} of {low_confidence} recovered by re-decoding" if low_confidence else ""))
+        else:
+            print(f"🔍 Confidence filtering: {total_segments} segments, all high quality!")
+
+        # Combine only high-confidence (or successfully re-decoded) segments
+        transcribed_text = " ".join([text for text in texts if text]).strip()
+
+        del all_segments
+
+        return transcribed_text
+
+    def redecode_span(self, audio_array, segment, mode, options, threshold):
+        """Decode the audio of one low-confidence segment again; returns its text or None
+
+        First the same model with a wider beam and temperature fallback, then
+        the redecode_mode model if that is a different one and already loaded
+        (never a load or download in the middle of a dictation). The cost
+        grows with the number of bad segments, not with the recording length.
+        """
+        pad = int(0.2 * self.sample_rate)
+        start = max(0, int(segment.start * self.sample_rate) - pad)
+        end = min(len(audio_array), int(segment.end * self.sample_rate) + pad)
+        if end <= start:
+            return None
+        clip = audio_array[start:end]
+
+        attempts = [mode or self.accuracy_mode]
+        larger = self.model_key(self.redecode_mode)
+        if larger != self.model_key(mode):
+            if self.inference_worker:
+                loaded = self.inference_worker.is_loaded(larger)
+            else:
+                loaded = self.model_pool.is_resident(larger)
+            if loaded:
+                attempts.append(self.redecode_mode)
+        for attempt in attempts:
+            beam_size = max(self.redecode_beam_size, self.mode_config(attempt)['beam_size'])
+            segments = list(self.decode(
+                clip,
+                mode=attempt,
+                **dict(options,
+                       initial_prompt=self.get_initial_prompt(attempt) or None,
+                       beam_size=beam_size,
+                       temperature=(0.0, 0.2, 0.4, 0.6, 0.8),  # Retried hotter while it still looks wrong
+                       condition_on_previous_text=False)
+            ))
+            if segments and all(s.avg_logprob >= threshold for s in segments):
+                text = " ".join(s.text.strip() for s in segments)
+                score = min(s.avg_logprob for s in segments)
+                print(f"   🔁 Re-decoded with {self.mode_config(attempt)['description']} (beam {beam_size}): "
+                      f"'{text}' (score: {segment.avg_logprob:.2f} → {score:.2f})")
+                return text
+        print(f"   🔁 Re-decoding didn't help, dropped '{segment.text.strip()}'")
+        return None
+
+    def decode(self, audio_array, mode=None, cancelled=None, **options):
+        """Run faster-whisper with an accuracy mode's model (default: the current one) and yield its segments
+
+        Every transcription goes through here, in process or in the inference worker.
+        Once cancelled() turns true, decoding stops at the next segment (or batch)
+        and DecodeCancelled is raised.
+        """
+        key = self.model_key(mode)
+        if self.inference_worker:
+            segments = self.inference_worker.transcribe(key, audio_array, options, cancelled)
+        else:
+            # MEMORY FIX: Ensure model is loaded before transcription (Issue #660)
+            # The pool reloads parked weights (fast) or the whole model if it was evicted
+            segments = whisper_segments(self.model_pool.acquire(key), audio_array, options)
+        if cancelled is None:
+            return segments
+
+        def until_cancelled():
+            for segment in segments:
+                if cancelled():
+                    raise DecodeCancelled()
+                yield segment
+            if cancelled():
+                raise DecodeCancelled()
+        return until_cancelled()
+
     def process_audio(self):
         """Process recorded audio: transcribe and type"""
         try:
@@ -1251,7 +2822,39 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             if memory_before > 1500:
                 print(f"⚠️  High memory usage before processing: {memory_before:.0f}MB")
 
-            if len(self.audio_data) == 0:
+            # Speech regions were tracked while recording - just analyse the last few windows
+            speech_timestamps = None
+            vad = self.streaming_vad
+            self.streaming_vad = None
+            if vad:
+                speech_timestamps = vad.finish()
+                print(f"🔍 VAD analysed {vad.summary()} while recording, "
+                      f"{len(speech_timestamps)} speech region(s)")
+
+            # Preprocessing ran while recording - finish it with the final statistics
+            preprocessed = None
+            streaming_preprocessor = self.streaming_preprocessor
+            self.streaming_preprocessor = None
+            if streaming_preprocessor:
+                # Noise floor and level from the speech regions the VAD just finished
+                capture_regions = None
+                if speech_timestamps and self.use_vad:
+                    capture_regions = speech_regions(speech_timestamps, self.audio_buffer.frames, self.sample_rate)
+                preprocessed = streaming_preprocessor.finish(capture_regions)
+                print("✨ Audio preprocessed while recording (enhanced quality)")
+
+            # Collect text already transcribed while recording (streaming mode)
+            transcribed_parts = []
+            tail_start = 0
+            streamer = self.streaming_transcriber
+            self.streaming_transcriber = None
+            if streamer:
+                print("⏳ Waiting for in-flight utterance...")
+                tail_start, transcribed_parts = streamer.finish()
+                print(f"⚡ Streamed {streamer.utterances} utterance(s) during recording, "
+                      f"{(self.audio_buffer.frames - tail_start) / self.sample_rate:.1f}s left to decode")
+
+            if self.audio_buffer.frames == 0:
                 print("❌ No audio recorded")
                 self.status_item.title = "Status: Ready ⚡"
                 self.title = "🎤⚡"
@@ -1259,9 +2862,43 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 self.cleanup_memory()
                 return
 
-            # Load model for current mode (lazy loading)
-            print(f"📦 Preparing {self.get_mode_name(self.accuracy_mode)}...")
-            if not self.load_model_for_mode(self.accuracy_mode):
+            # No-speech fast path: VAD found no speech region and no frame was
+            # confidently speech, so don't load a model to transcribe silence
+            # (that is the slowest path and Whisper hallucinates on it)
+            if (vad and not speech_timestamps and not transcribed_parts
+                    and vad.max_probability < vad.threshold + self.no_speech_margin):
+                self.no_speech_skips += 1
+                print(f"🔇 No speech detected (best VAD frame {vad.max_probability:.2f}) - "
+                      f"skipped transcription ({self.no_speech_skips} so far)")
+                self.audio_buffer.reset()
+                self.status_item.title = "Status: Ready ⚡"
+                self.title = "🎤⚡"
+                self.processing = False
+                self.cleanup_memory(park_models=False)  # The prepared model follows the residency policy
+                return
+
+            # A refinement still running belongs to an older dictation - it stops at its
+            # next segment (or batch), so the two decodes never share a model
+            refining = self.refine_thread
+            if refining and refining.is_alive():
+                print("⏳ Dropping the previous dictation's refinement...")
+                refining.join()
+
+            # Wait for the load started with the recording, if it hasn't finished yet
+            preparing = self.model_preparing
+            self.model_preparing = None
+            if preparing and preparing.is_alive():
+                print("⏳ Waiting for the model load started with the recording...")
+                preparing.join()
+
+            # Two-pass: a fast draft is typed first, the accuracy mode's model refines it afterwards
+            draft_mode = self.two_pass_draft_mode if self.two_pass_enabled() else None
+            refine_audio = None
+            dictation = self.dictations
+
+            # Load model for current mode (lazy loading - instant if it was prepared)
+            print(f"📦 Preparing {self.get_mode_name(draft_mode or self.accuracy_mode)}...")
+            if not self.load_model_for_mode(draft_mode or self.accuracy_mode):
                 print("❌ Failed to load model")
                 self.status_item.title = "Status: Ready ⚡"
                 self.title = "🎤⚡"
@@ -1269,164 +2906,64 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 self.cleanup_memory()
                 return
 
-            # Combine audio chunks
-            audio_array = np.concatenate(self.audio_data, axis=0)
-            audio_array = audio_array.flatten()
-
-            # Clear audio data chunks immediately to free memory
-            self.audio_data.clear()  # More explicit than = []
-            self.audio_data = []
-
-            # Apply Voice Activity Detection first (removes silence)
-            print("🔍 Detecting speech...")
-            audio_array = self.apply_vad(audio_array)
-
-            # Preprocess audio for better accuracy
-            audio_array = self.preprocess_audio(audio_array)
-
-            # Save to temp WAV file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            temp_file_path = temp_file.name
-            with wave.open(temp_file_path, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(self.sample_rate)
-                # Convert to int16, write, then let GC clean up the intermediate array
-                audio_bytes = (audio_array * 32767).astype(np.int16).tobytes()
-                wf.writeframes(audio_bytes)
-                del audio_bytes  # Free the bytes immediately
-
-            # CRITICAL: Delete audio_array NOW - no longer needed after file write
-            # This is a large NumPy array in C memory that must be freed explicitly
-            del audio_array
-            import gc
-            gc.collect()  # Force immediate collection of the array
-
-            # Get mode-specific settings
-            mode_settings = self.get_mode_settings()
-            current_model = mode_settings['model']
-            beam_size = mode_settings['beam_size']
-            temperature = mode_settings['temperature']
-            mode_description = mode_settings['description']
-
-            # MEMORY FIX: Ensure model is loaded before transcription (Issue #660)
-            # If model was unloaded to save memory, reload it now (fast operation)
-            if not current_model.model.model_is_loaded:
-                print("📦 Reloading model from memory...")
-                current_model.model.load_model(keep_cache=False)
-                print("✅ Model reloaded")
-
-            # Transcribe with faster-whisper using mode-specific settings
-            print(f"🔄 Transcribing with {mode_description} ({self.get_language_name(self.input_language)})...")
-
-            # Initial prompt for context (language-specific and mode-aware)
-            # Research shows detailed prompts improve accuracy for both languages
-            if self.input_language == 'en':
-                if self.accuracy_mode in ['clarity', 'max']:
-                    initial_prompt = (
-                        "This is a voice dictation for professional or personal use. "
-                        "The speaker may include unclear speech, mumbling, partial words, or corrections. "
-                        "Use contextual clues to infer intended words. Accurately transcribe: "
-                        "technical terminology, software names, programming concepts, casual conversational phrases, "
-                        "proper nouns, brand names, acronyms, and natural speech patterns. "
-                        "Preserve the speaker's intended meaning even with imperfect pronunciation."
-                    )
-                else:
-                    initial_prompt = (
-                        "This is a voice dictation for technical work, chat messages, emails, or AI prompts. "
-                        "Accurately transcribe: technical terms, software names, programming concepts, "
-                        "casual language, proper nouns, brand names, and acronyms. "
-                        "Maintain natural conversational tone."
-                    )
-            else:  # Spanish
-                if self.accuracy_mode in ['clarity', 'max']:
-                    initial_prompt = (
-                        "Este es un dictado de voz para uso profesional o personal en español latinoamericano. "
-                        "El hablante puede incluir habla poco clara, murmullos, palabras parciales o correcciones. "
-                        "Usa claves del contexto para inferir las palabras pretendidas. Transcribe con precisión: "
-                        "terminología técnica, nombres de software, conceptos de programación, frases conversacionales casuales, "
-                        "nombres propios, nombres de marcas, acrónimos y patrones naturales del habla. "
-                        "Preserva el significado pretendido del hablante incluso con pronunciación imperfecta. "
-                        "Incluye variaciones dialectales de América Latina."
-                    )
-                else:
-                    initial_prompt = (
-                        "Este es un dictado de voz para trabajo técnico, mensajes de chat, emails o prompts de IA en español. "
-                        "Transcribe con precisión: términos técnicos, nombres de software, conceptos de programación, "
-                        "lenguaje casual, nombres propios, nombres de marcas y acrónimos. "
-                        "Mantén el tono conversacional natural. Incluye variaciones dialectales de América Latina."
-                    )
-
-            # Language-adaptive thresholds for better bilingual support
-            # Spanish speech patterns need more sensitive detection
-            no_speech_thresh = 0.5 if self.input_language == 'es' else 0.6
-
-            segments, info = current_model.transcribe(
-                temp_file_path,
-                language=self.input_language,  # Use selected input language
-                beam_size=beam_size,  # Mode-specific beam size
-                temperature=temperature,  # Mode-specific temperature
-                initial_prompt=initial_prompt,
-                vad_filter=False,  # We already did VAD
-                condition_on_previous_text=True,
-                compression_ratio_threshold=1.35,  # Research-backed optimal value for both languages
-                log_prob_threshold=-1.0,
-                no_speech_threshold=no_speech_thresh  # Language-adaptive threshold
-            )
-
-            # Collect all segments with confidence filtering
-            # Filter out low-confidence segments to reduce hallucinations
-            all_segments = list(segments)
-
-            # Determine confidence threshold based on accuracy mode
-            if self.accuracy_mode == 'max':
-                confidence_threshold = -0.8  # Stricter for max accuracy
+            # Take one float32 working copy of the (remaining) capture buffer
+            recording_seconds = self.audio_buffer.seconds
+            if preprocessed is not None:
+                audio_array = preprocessed[tail_start:]
             else:
-                confidence_threshold = -1.0  # Standard threshold
-
-            high_confidence_segments = []
-            filtered_count = 0
-
-            for segment in all_segments:
-                # Check avg_logprob (average log probability) for confidence
-                # Higher values (closer to 0) = more confident
-                # Typical range: -2.0 (low) to -0.3 (high)
-                if hasattr(segment, 'avg_logprob') and segment.avg_logprob < confidence_threshold:
-                    # Low confidence - filter out
-                    filtered_count += 1
-                    if segment.avg_logprob < -1.5:
-                        # Very low confidence - likely hallucination
-                        print(f"   🔍 Filtered LOW confidence segment: '{segment.text.strip()}' (score: {segment.avg_logprob:.2f})")
-                    else:
-                        print(f"   🔍 Filtered segment: '{segment.text.strip()}' (score: {segment.avg_logprob:.2f})")
+                audio_array = self.audio_buffer.to_float32(tail_start)
+
+            # Release the captured audio immediately to free memory
+            self.audio_buffer.reset()
+
+            # Streaming output: type each piece of text as soon as it exists,
+            # starting with the utterances transcribed while recording
+            on_segment = None
+            self.typed_output = ""
+            if self.streaming_output:
+                on_segment = self.type_segment
+                for part in transcribed_parts:
+                    self.type_segment(part)
+
+            if len(audio_array) > 0:
+                # Voice Activity Detection first: speech regions the decoder will skip to
+                print("🔍 Detecting speech...")
+                if speech_timestamps is not None:
+                    # Shift the recorded regions onto the tail we still have to decode
+                    speech_timestamps = [
+                        {'start': max(0, ts['start'] - tail_start), 'end': ts['end'] - tail_start}
+                        for ts in speech_timestamps if ts['end'] > tail_start
+                    ]
+                if speech_timestamps == [] and transcribed_parts:
+                    # Everything after the streamed utterances is silence
+                    print("🔇 No speech left after the streamed utterances")
+                    tail_text = ""
                 else:
-                    # High confidence - keep it
-                    high_confidence_segments.append(segment)
-
-            # Log filtering results
-            total_segments = len(all_segments)
-            kept_segments = len(high_confidence_segments)
-
-            if filtered_count > 0:
-                print(f"🔍 Confidence filtering: {total_segments} segments, {kept_segments} kept, {filtered_count} filtered")
-            else:
-                print(f"🔍 Confidence filtering: {total_segments} segments, all high quality!")
-
-            # Combine only high-confidence segments
-            transcribed_text = " ".join([segment.text for segment in high_confidence_segments]).strip()
+                    regions = self.find_speech_regions(audio_array, speech_timestamps)
+                    if preprocessed is not None and regions is None:
+                        audio_array = self.preprocessor.trim(audio_array)
+
+                    if draft_mode:
+                        # Both passes decode the same cleaned audio
+                        if preprocessed is None:
+                            audio_array = self.preprocess_audio(audio_array, regions=regions)
+                        refine_audio = (audio_array, regions, list(transcribed_parts), recording_seconds)
+                        print("✏️  Draft pass")
+                        # The refining pass decodes everything again, so no re-decoding in the draft
+                        tail_text = self.transcribe_audio(audio_array, preprocessed=True, regions=regions,
+                                                          mode=draft_mode, on_segment=on_segment,
+                                                          redecode=False, recording_seconds=recording_seconds)
+                    else:
+                        tail_text = self.transcribe_audio(audio_array, preprocessed=preprocessed is not None,
+                                                          regions=regions, on_segment=on_segment,
+                                                          recording_seconds=recording_seconds)
+                del audio_array
+                if tail_text:
+                    transcribed_parts.append(tail_text)
+
+            transcribed_text = " ".join(transcribed_parts).strip()
             print(f"📝 Transcribed ({self.input_language}): {transcribed_text}")
 
-            # CRITICAL FIX: GC immediately after transcribe (official fix from PR #448)
-            # This frees PyAV audio decoding memory before it leaks
-            import gc
-            gc.collect()
-            print("🧹 Freed audio decoding memory")
-
-            # Delete temp file immediately and clear reference
-            os.unlink(temp_file_path)
-            del temp_file
-            del temp_file_path
-
             if not transcribed_text:
                 print("❌ No speech detected")
                 self.status_item.title = "Status: Ready ⚡"
@@ -1434,31 +2971,38 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                 self.processing = False  # Reset processing flag
                 return
 
-            # Translate if input and output languages are different
-            if self.input_language != self.output_language:
-                print(f"🌐 Translating {self.input_language}→{self.output_language}...")
-                transcribed_text = self.translate_text(
-                    transcribed_text,
-                    self.input_language,
-                    self.output_language
-                )
-
-            # Optimize text for chat/tech context (language-aware)
-            print("✨ Optimizing text...")
-            corrected_text = self.correct_grammar(transcribed_text, self.output_language)
-            print(f"✅ Final: {corrected_text}")
+            if on_segment:
+                # Already typed segment by segment
+                corrected_text = self.typed_output
+                print(f"✅ Final: {corrected_text}")
+            else:
+                corrected_text = self.finalize_text(transcribed_text)
 
-            # Type the text
-            print("⌨️  Typing...")
-            self.type_text(corrected_text)
+                # Type the text
+                print("⌨️  Typing...")
+                self.type_text(corrected_text)
             print("✅ Done!")
 
+            if refine_audio is not None:
+                refine_audio = (dictation, corrected_text) + refine_audio
+                self.refining = True  # Keeps the residency policy from parking the models under it
+
+            if self.inference_worker and not self.refining:
+                self.inference_worker.dictation_finished()  # Recycle only between dictations
+
             # MEMORY FIX: Unload model to free CTranslate2 memory (Issue #660)
-            # This is the proper way to free memory with CTranslate2's caching allocator
-            if current_model and current_model.model.model_is_loaded:
-                print(f"🧹 Unloading {mode_description} model to free memory...")
-                current_model.model.unload_model()  # Unload CTranslate2 model
-                print(f"✅ Model unloaded")
+            # This is the proper way to free memory with CTranslate2's caching allocator,
+            # unless the residency policy expects another dictation soon
+            mode_description = self.get_mode_settings()['description']
+            keep_seconds = self.residency.keep_seconds()
+            if keep_seconds == 0:
+                if self.release_models():
+                    print(f"🧹 Unloaded {mode_description} model weights to free memory")
+            elif keep_seconds == float('inf'):
+                print(f"🧠 Keeping {mode_description} model loaded (always resident)")
+            else:
+                print(f"🧠 Keeping {mode_description} model loaded for {keep_seconds:.0f}s "
+                      f"({self.residency.policy} policy)")
 
             # Measure memory BEFORE cleanup for accurate comparison
             memory_before_cleanup = process.memory_info().rss / 1024 / 1024
@@ -1466,34 +3010,13 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             # Delete transcription data that's no longer needed
             del transcribed_text
             del corrected_text
-            del segments
-            del info
-            import gc
-            gc.collect()
 
-            # Unload unused model to save memory
-            self.unload_unused_model()
-
-            # Comprehensive memory cleanup
-            self.cleanup_memory()
-
-            # Force Python to release memory to OS (extremely aggressive)
-            import ctypes
-            gc.collect(0)  # Young generation
-            gc.collect(1)  # Middle generation
-            gc.collect(2)  # Old generation
-            gc.collect()   # Full collection
-
-            # On Linux/Mac, try to force memory back to OS
-            try:
-                libc = ctypes.CDLL("libc.dylib")  # Mac
-                libc.malloc_trim(0)
-            except:
-                try:
-                    libc = ctypes.CDLL("libc.so.6")  # Linux
-                    libc.malloc_trim(0)
-                except:
-                    pass  # Windows or unable to trim
+            # Comprehensive memory cleanup (the pool collects and trims the heap)
+            self.cleanup_memory(park_models=False)
+            if self.inference_worker:
+                print(f"🧩 Inference worker: {self.inference_worker.summary()}")
+            else:
+                print(f"📦 Model pool: {self.model_pool.summary()}")
 
             # Measure memory AFTER cleanup
             memory_after_cleanup = process.memory_info().rss / 1024 / 1024
@@ -1521,6 +3044,11 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             self.title = "🎤⚡"
             self.processing = False  # Reset processing flag
 
+            if refine_audio is not None:
+                # Refine in the background so the next dictation can start right away
+                self.refine_thread = threading.Thread(target=self.refine_draft, args=refine_audio, daemon=True)
+                self.refine_thread.start()
+
         except Exception as e:
             print(f"❌ Error processing audio: {e}")
             import traceback
@@ -1528,10 +3056,139 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             self.status_item.title = "Status: Ready ⚡"
             self.title = "🎤⚡"
             self.processing = False  # Reset processing flag even on error
+            self.refining = bool(self.refine_thread and self.refine_thread.is_alive())
 
             # Always cleanup memory on error
             self.cleanup_memory()
 
+        finally:
+            # Every way out counts, so the residency policy parks on time after empty dictations too
+            self.residency.dictation_finished()
+
+    def finalize_text(self, transcribed_text):
+        """Translate (if needed) and clean up transcribed text for typing"""
+        # Translate if input and output languages are different
+        if self.input_language != self.output_language:
+            print(f"🌐 Translating {self.input_language}→{self.output_language}...")
+            transcribed_text = self.translate_text(
+                transcribed_text,
+                self.input_language,
+                self.output_language
+            )
+
+        # Optimize text for chat/tech context (language-aware)
+        print("✨ Optimizing text...")
+        corrected_text = self.correct_grammar(transcribed_text, self.output_language)
+        print(f"✅ Final: {corrected_text}")
+        return corrected_text
+
+    def type_segment(self, text):
+        """Streaming output: translate (if needed), clean up and type one piece of text right away"""
+        text = text.strip()
+        if not text:
+            return
+        if self.input_language != self.output_language:
+            text = self.translate_text(text, self.input_language, self.output_language)
+        cleaned = self.correct_grammar(text, self.output_language)
+        if not cleaned:
+            return
+        if self.typed_output:
+            # A segment that continues a sentence keeps its lowercase start
+            if self.typed_output[-1] not in '.!?' and text[0].islower():
+                cleaned = cleaned[0].lower() + cleaned[1:]
+            text = " " + cleaned
+        else:
+            text = cleaned
+            print("⌨️  Typing as segments arrive...")
+        # Only the first piece waits for the hotkey to be released
+        self.type_text(text, delay=0 if self.typed_output else 0.3)
+        self.typed_output += text
+
+    def two_pass_enabled(self):
+        """Whether this dictation gets a fast draft before the accuracy mode's result"""
+        return self.two_pass and self.accuracy_mode != self.two_pass_draft_mode
+
+    def refine_draft(self, dictation, draft_text, audio_array, regions, streamed_parts, recording_seconds):
+        """Second pass of two-pass dictation: re-decode with the accuracy mode's model
+
+        Runs on its own thread after the dictation finished. The refined text
+        replaces the typed draft if nothing was typed or clicked since;
+        otherwise it is offered from the menu bar instead. Once a new
+        dictation starts the refinement is dropped at its next segment (or
+        batch), in process and in the inference worker.
+        """
+        def stale():
+            return self.dictations != dictation
+
+        def check_current():
+            if stale():
+                raise DecodeCancelled()
+
+        self.status_item.title = "Status: Refining..."
+        input_events = self.user_input_events
+        # Clicks move the cursor (or focus) too, so watch the mouse while refining
+        click_listener = mouse.Listener(on_click=self.on_click)
+        click_listener.start()
+        try:
+            print(f"🎯 Refining with {self.get_mode_name(self.accuracy_mode)}...")
+            if not self.load_model_for_mode(self.accuracy_mode):
+                return
+            check_current()
+            tail_text = self.transcribe_audio(audio_array, preprocessed=True, regions=regions,
+                                              recording_seconds=recording_seconds, cancelled=stale)
+            transcribed_text = " ".join(streamed_parts + [tail_text]).strip()
+            if not transcribed_text:
+                return
+            refined_text = self.finalize_text(transcribed_text)
+            check_current()
+        except Exception as e:
+            if stale():
+                print("⏭️  Refinement dropped: a new dictation started")
+            else:
+                print(f"⚠️  Refinement failed, keeping the draft: {e}")
+            return
+        finally:
+            click_listener.stop()
+            self.refining = False
+            if not stale():
+                self.status_item.title = "Status: Ready ⚡"
+            if self.inference_worker and not self.recording and not self.processing:
+                self.inference_worker.dictation_finished()  # The dictation ends with its refinement
+            if self.residency.keep_seconds() == 0 and not self.recording and not self.processing:
+                self.release_models()  # Both passes' models follow the residency policy now
+
+        if refined_text == draft_text:
+            print("✅ Refinement matches the draft")
+        elif self.user_input_events == input_events:
+            self.replace_typed_text(draft_text, refined_text)
+            print("✨ Draft replaced with the refined text")
+        else:
+            # The draft is no longer the latest insertion - don't type into whatever is there now
+            self.refined_text = refined_text
+            self.refined_item.title = "✨ Copy Refined Text"
+            print("✨ Refined text ready in the menu (you typed or clicked since the draft)")
+
+    def replace_typed_text(self, old_text, new_text):
+        """Turn just-typed old_text into new_text: erase after the common prefix, type the rest"""
+        common = len(os.path.commonprefix([old_text, new_text]))
+        self.typing = True  # Set flag before typing to prevent listener interference
+        try:
+            for _ in range(len(old_text) - common):
+                self.keyboard_controller.tap(Key.backspace)
+            self.keyboard_controller.type(new_text[common:])
+        finally:
+            self.typing = False  # Always reset flag, even if typing fails
+
+    def copy_refined_text(self, _):
+        """Menu: copy the last refined text that could not replace its draft"""
+        if not self.refined_text:
+            return
+        import subprocess
+        subprocess.run(['pbcopy'], input=self.refined_text.encode('utf-8'))
+        print("📋 Refined text copied to the clipboard")
+        self.refined_text = None
+        self.refined_item.title = "✨ Refined Text: none"
+
     def correct_grammar(self, text, language='en'):
         """Correct grammar while preserving casual chat/tech context (bilingual)"""
         try:
@@ -1595,9 +3252,9 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
 
         return text
 
-    def type_text(self, text):
+    def type_text(self, text, delay=0.3):
         """Type the text"""
-        time.sleep(0.3)
+        time.sleep(delay)
         self.typing = True  # Set flag before typing to prevent listener interference
         try:
             self.keyboard_controller.type(text)
@@ -1609,6 +3266,7 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
         # Ignore keyboard events while we're auto-typing to prevent interference
         if self.typing:
             return
+        self.user_input_events += 1  # Anything typed by hand means a draft may no longer be patched
 
         try:
             key_name = None
@@ -1705,6 +3363,11 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
             import traceback
             traceback.print_exc()
 
+    def on_click(self, x, y, button, pressed):
+        """Count mouse clicks while a two-pass draft is being refined"""
+        if pressed:
+            self.user_input_events += 1
+
     def cleanup(self):
         """Clean up all resources before exit"""
         try:
@@ -1739,15 +3402,12 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
                     print(f"   ⚠️  Keyboard listener cleanup: {e}")
 
             # Clean up models to reduce resource leaks
-            if hasattr(self, 'whisper_model_small'):
+            if hasattr(self, 'model_pool'):
                 try:
                     print("   Cleaning up AI models...")
-                    del self.whisper_model_small
-                except:
-                    pass
-            if hasattr(self, 'whisper_model_medium'):
-                try:
-                    del self.whisper_model_medium
+                    self.model_pool.clear()
+                    if self.inference_worker:
+                        self.inference_worker.stop()
                 except:
                     pass
             if hasattr(self, 'vad_model'):
@@ -1773,7 +3433,603 @@ class VoiceToTextMenuBarEnhanced(rumps.App):
         self.cleanup()
         rumps.quit_application()
 
+# ---------------------------------------------------------------------------
+# Benchmarks: python voice_to_text_menubar_enhanced.py --benchmark <name> [args]
+# ---------------------------------------------------------------------------
+
+def synthetic_speech(sample_rate=16000, seconds=60, seed=0):
+    """Deterministic speech-like test signal: voiced bursts with pauses over room noise"""
+    rng = np.random.default_rng(seed)
+    n = int(sample_rate * seconds)
+    t = np.arange(n) / sample_rate
+    audio = 0.003 * rng.standard_normal(n)  # Room noise floor
+
+    position = int(0.5 * sample_rate)
+    while position < n:
+        length = int(rng.uniform(0.3, 2.5) * sample_rate)
+        end = min(n, position + length)
+        pitch = rng.uniform(90, 250)
+        segment_t = t[position:end]
+        voiced = sum(np.sin(2 * np.pi * pitch * k * segment_t) / k for k in range(1, 8))
+        envelope = np.sin(np.pi * np.linspace(0, 1, end - position)) * rng.uniform(0.05, 0.6)
+        audio[position:end] += voiced * envelope * 0.3
+        position = end + int(rng.uniform(0.1, 1.2) * sample_rate)
+
+    return np.clip(audio, -1, 1).astype(np.float32)
+
+def legacy_preprocess_stages(sample_rate, mode, compression_ratio):
+    """Pre-engine preprocessing as (name, function) stages - the accuracy/speed/memory reference"""
+    from scipy import signal
+
+    def band_pass(audio_array):
+        sos_high = signal.butter(4, 300, 'hp', fs=sample_rate, output='sos')
+        audio_array = signal.sosfilt(sos_high, audio_array)
+        sos_low = signal.butter(4, 7800, 'lp', fs=sample_rate, output='sos')
+        return signal.sosfilt(sos_low, audio_array)
+
+    def noise_gate(audio_array):
+        fraction, floor_gain = (0.05, 0.02) if mode in ['clarity', 'max'] else (0.1, 0.05)
+        sorted_abs = np.sort(np.abs(audio_array))
+        noise_threshold = sorted_abs[int(len(sorted_abs) * fraction)]
+        mask = np.abs(audio_array) > noise_threshold
+        return audio_array * (floor_gain + (1 - floor_gain) * mask)
+
+    def normalize(audio_array):
+        max_val = np.abs(audio_array).max()
+        if max_val > 0:
+            audio_array = audio_array / max_val * 0.95
+        return audio_array
+
+    def compress(audio_array):
+        threshold_db = -20
+        audio_db = 20 * np.log10(np.abs(audio_array) + 1e-10)
+        over_threshold = audio_db > threshold_db
+        compressed_db = audio_db.copy()
+        compressed_db[over_threshold] = threshold_db + (audio_db[over_threshold] - threshold_db) / compression_ratio
+        return np.sign(audio_array) * (10 ** (compressed_db / 20))
+
+    def trim(audio_array):
+        non_silent = np.abs(audio_array) > 0.01
+        if non_silent.any():
+            first_sound = np.argmax(non_silent)
+            last_sound = len(audio_array) - np.argmax(non_silent[::-1]) - 1
+            margin = int(0.1 * sample_rate)
+            audio_array = audio_array[max(0, first_sound - margin):min(len(audio_array), last_sound + margin)]
+        return audio_array
+
+    return [('filter', band_pass), ('noise gate', noise_gate), ('normalize', normalize),
+            ('compress', compress), ('trim', trim)]
+
+def legacy_preprocess_audio(audio_array, sample_rate, mode, compression_ratio):
+    """Pre-engine preprocessing, kept as the reference for benchmarks"""
+    for _, stage in legacy_preprocess_stages(sample_rate, mode, compression_ratio):
+        audio_array = stage(audio_array)
+    return audio_array
+
+def best_time(fn, repeats):
+    """Fastest wall time of `repeats` runs (seconds) and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def reference_clip(path='', sample_rate=16000, seconds=30):
+    """Mono float32 audio from a WAV file, or synthetic speech when no path is given"""
+    if not path:
+        return synthetic_speech(sample_rate, seconds)
+    from scipy.io import wavfile
+    from scipy import signal
+    rate, data = wavfile.read(path)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    if data.dtype.kind in 'iu':
+        data = data / float(np.iinfo(data.dtype).max)
+    if rate != sample_rate:
+        data = signal.resample_poly(data, sample_rate, rate)
+    return data.astype(np.float32)
+
+def benchmark_preprocess(seconds='60', repeats='5'):
+    """Legacy vs engine preprocessing per accuracy mode"""
+    sample_rate = 16000
+    seconds, repeats = float(seconds), int(repeats)
+    audio = synthetic_speech(sample_rate, seconds)
+    engine = AudioPreprocessor(sample_rate)
+
+    print(f"Preprocessing {seconds:.0f}s of synthetic speech, best of {repeats} runs\n")
+    print(f"{'mode':<10}{'legacy ms':>12}{'engine ms':>12}{'speedup':>10}{'max |diff|':>14}")
+    for mode, settings in ACCURACY_MODES.items():
+        ratio = settings['compression_ratio']
+        legacy_s, reference = best_time(
+            lambda: legacy_preprocess_audio(audio, sample_rate, mode, ratio), repeats)
+        # The engine works in place, so each run gets a fresh copy (counted in its time)
+        engine_s, result = best_time(lambda: engine.process(audio.copy(), mode, ratio), repeats)
+        if len(result) == len(reference):
+            diff = f"{np.abs(result - reference).max():.2e}"
+        else:
+            diff = f"len {len(result)}≠{len(reference)}"
+        print(f"{mode:<10}{legacy_s * 1000:>12.1f}{engine_s * 1000:>12.1f}"
+              f"{legacy_s / engine_s:>9.1f}x{diff:>14}")
+    return 0
+
+def benchmark_memory(seconds='120', mode='clarity'):
+    """Peak extra memory per stage: legacy float64 pipeline vs in-place float32 engine"""
+    import tracemalloc  # NumPy reports its buffers to tracemalloc
+    sample_rate = 16000
+    seconds = float(seconds)
+    ratio = ACCURACY_MODES[mode]['compression_ratio']
+    audio = synthetic_speech(sample_rate, seconds)
+    # Fixed speech regions stand in for VAD output: 0.8s of every second
+    timestamps = [{'start': i * sample_rate, 'end': i * sample_rate + int(0.8 * sample_rate)}
+                  for i in range(int(seconds))]
+
+    def legacy_vad(audio_array):
+        return np.concatenate([audio_array[ts['start']:ts['end']] for ts in timestamps])
+
+    engine = AudioPreprocessor(sample_rate)
+    legacy_stages = [('vad', legacy_vad)] + legacy_preprocess_stages(sample_rate, mode, ratio)
+
+    def engine_stages():
+        working = {}
+
+        def vad(audio_array):
+            # Regions are ranges over the buffer: nothing is copied out
+            speech_regions(timestamps, len(audio_array), sample_rate)
+            working['scratch'] = np.empty_like(audio_array)
+            return audio_array
+        # The scratch array is created in the vad stage and charged to it
+        return [
+            ('vad', vad),
+            ('filter', engine.band_pass),
+            ('noise gate', lambda a: engine.noise_gate(a, mode, working['scratch'][:len(a)])),
+            ('normalize', engine.normalize),
+            ('compress', lambda a: engine.compress(a, ratio, working['scratch'][:len(a)])),
+            ('trim', lambda a: engine.trim(a, working['scratch'][:len(a)])),
+        ]
+
+    def measure(stages, audio_array):
+        peaks = []
+        tracemalloc.start()
+        for name, stage in stages:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            audio_array = stage(audio_array)
+            peaks.append((name, tracemalloc.get_traced_memory()[1] - base))
+        tracemalloc.stop()
+        return peaks
+
+    legacy = measure(legacy_stages, audio)
+    engine_peaks = measure(engine_stages(), audio.copy())
+
+    input_mb = audio.nbytes / 1024 / 1024
+    print(f"Peak extra memory per stage, {seconds:.0f}s recording ({input_mb:.1f}MB float32), {mode} mode\n")
+    print(f"{'stage':<12}{'legacy MB':>12}{'in-place MB':>14}")
+    for (name, before), (_, after) in zip(legacy, engine_peaks):
+        print(f"{name:<12}{before / 1024 / 1024:>12.1f}{after / 1024 / 1024:>14.1f}")
+    print(f"{'max':<12}{max(p for _, p in legacy) / 1024 / 1024:>12.1f}"
+          f"{max(p for _, p in engine_peaks) / 1024 / 1024:>14.1f}")
+    return 0
+
+def benchmark_streaming_preprocess(seconds='60', block_ms='32'):
+    """Streaming vs batch preprocessing: output parity and work left after stop"""
+    sample_rate = 16000
+    seconds, block = float(seconds), int(sample_rate * float(block_ms) / 1000)
+    audio = synthetic_speech(sample_rate, seconds)
+    engine = AudioPreprocessor(sample_rate)
+
+    # Statistics from the whole capture, and from speech regions (1-7s of every 10s) as the app does
+    speech = [(start, min(start + 6 * sample_rate, len(audio)))
+              for start in range(sample_rate, len(audio), 10 * sample_rate)]
+
+    print(f"{seconds:.0f}s of synthetic speech captured as int16 in {block}-sample callbacks\n")
+    print(f"{'mode':<10}{'statistics':<12}{'batch ms':>10}{'at stop ms':>12}{'max |diff|':>14}")
+    worst = 0.0
+    for mode, settings in ACCURACY_MODES.items():
+        ratio = settings['compression_ratio']
+        for label, regions in (('all audio', None), ('speech', speech)):
+            capture = AudioCaptureBuffer(sample_rate)
+            streaming = StreamingPreprocessor(capture, engine, mode, ratio)
+            for start in range(0, len(audio), block):
+                capture.write(audio[start:start + block])
+                if (start // block) % 4 == 0:
+                    streaming._drain()  # What the worker does between callbacks
+
+            batch_s, reference = best_time(
+                lambda: engine.process(capture.to_float32(), mode, ratio, trim=False, regions=regions), 1)
+            finish_s, result = best_time(lambda: streaming.finish(regions), 1)
+            diff = float(np.abs(result - reference).max())
+            worst = max(worst, diff)
+            print(f"{mode:<10}{label:<12}{batch_s * 1000:>10.1f}{finish_s * 1000:>12.1f}{diff:>14.2e}")
+
+    # Streaming must reproduce the batch reference
+    tolerance = 1e-5
+    print(f"\n{'✅' if worst <= tolerance else '❌'} Streaming matches batch within {tolerance:g}")
+    return 0 if worst <= tolerance else 1
+
+def benchmark_streaming_replay(pause_ms='200'):
+    """Check: 2s of speech, a short pause, then ongoing speech must not be cut at the pause"""
+    sample_rate = 16000
+    t = np.arange(int(3 * sample_rate)) / sample_rate
+    tone = (0.2 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+    silence = np.zeros(sample_rate, dtype=np.float32)
+
+    buffer = AudioCaptureBuffer(sample_rate, dtype=np.float32)
+    # Scripted probabilities stand in for Silero: loud windows are speech
+    vad = StreamingVAD(buffer, lambda window: 0.9 if np.sqrt(np.mean(window ** 2)) > 0.01 else 0.0,
+                       threshold=0.5)
+    clips = []
+    transcriber = StreamingTranscriber(buffer, vad, lambda audio: clips.append(len(audio) / sample_rate) or "")
+
+    def play(audio):
+        # 100ms callbacks with a VAD pass and a transcriber poll after each
+        for start in range(0, len(audio), sample_rate // 10):
+            buffer.write(audio[start:start + sample_rate // 10])
+            vad._drain()
+            transcriber._consume_finished_utterances()
+
+    play(tone[:2 * sample_rate])
+    play(silence[:int(float(pause_ms) * sample_rate / 1000)])
+    play(tone)
+    while_speaking = list(clips)
+    play(silence)
+
+    print(f"2s speech, {float(pause_ms):.0f}ms pause, 3s speech, 1s silence")
+    print(f"   clips sent while still speaking: {while_speaking or 'none'}")
+    print(f"   clips sent after the silence:    {clips[len(while_speaking):] or 'none'}")
+    if float(pause_ms) * sample_rate / 1000 >= transcriber.min_silence:
+        # A real pause: the first sentence may go while the second is spoken
+        passed = len(clips) == 2 and len(while_speaking) <= 1
+        print(f"{'✅' if passed else '❌'} Split at the {float(pause_ms):.0f}ms pause")
+    else:
+        passed = not while_speaking and len(clips) == 1 and clips[0] >= 5.0
+        print(f"{'✅' if passed else '❌'} The pause {'stayed inside' if passed else 'split'} the utterance")
+    return 0 if passed else 1
+
+def benchmark_vad_gate(clip='', muted='0.3'):
+    """Silero alone vs energy gate + Silero on a speech clip: model calls, time and speech regions"""
+    if not clip:
+        print("❌ Pass a WAV file with speech: --benchmark vad-gate <clip.wav> [muted fraction]")
+        return 1
+    sample_rate = 16000
+    muted = float(muted)
+    model_path = find_silero_onnx_model()
+    if not model_path:
+        print("❌ silero_vad ONNX model not found (pip install silero-vad onnxruntime)")
+        return 1
+    model = SileroOnnxVAD(model_path, sample_rate)
+
+    # Mute the microphone (digital silence) for part of each 10s of the clip
+    audio = reference_clip(clip, sample_rate)
+    period = 10 * sample_rate
+    for start in range(0, len(audio), period):
+        audio[start:start + int(muted * period)] = 0
+
+    def run(gate):
+        vad = StreamingVAD(AudioCaptureBuffer(sample_rate, data=audio), model, threshold=0.5,
+                           reset=model.reset_states, gate=gate)
+        return vad, vad.finish()
+
+    print(f"{len(audio) / sample_rate:.0f}s of {os.path.basename(clip)}, microphone muted {muted:.0%} of the time\n")
+    print(f"{'tiers':<22}{'ms':>10}{'model calls':>14}{'regions':>10}")
+    results = []
+    for name, gate in (('silero', None), ('energy gate + silero', EnergyGate())):
+        elapsed, (vad, timestamps) = best_time(lambda: run(gate), 1)
+        results.append(timestamps)
+        print(f"{name:<22}{elapsed * 1000:>10.1f}{vad.model_windows:>14}{len(timestamps):>10}")
+        print(f"  {vad.summary()}")
+
+    if not results[0]:
+        print("\n❌ Silero found no speech in this clip - nothing to compare")
+        return 1
+    for ungated, gated in zip(results[0], results[1]):
+        print(f"  {ungated['start'] / sample_rate:7.2f}-{ungated['end'] / sample_rate:7.2f}s  "
+              f"gated {gated['start'] / sample_rate:7.2f}-{gated['end'] / sample_rate:7.2f}s")
+    same = results[0] == results[1]
+    print(f"\n{'✅' if same else '⚠️ '} Speech regions {'identical' if same else 'differ'} with the gate")
+    return 0 if same else 1
+
+def benchmark_models(clip='', *variants):
+    """Load time, measured memory and decode speed per accuracy mode (or named model variants)"""
+    audio = reference_clip(clip)
+    seconds = len(audio) / 16000
+    if variants:
+        configs = [(name, dict(ACCURACY_MODES['clarity'], model_name=name)) for name in variants]
+    else:
+        configs = list(ACCURACY_MODES.items())
+
+    print(f"{seconds:.0f}s {'clip ' + clip if clip else 'of synthetic speech'}, {os.cpu_count()} cores\n")
+    print(f"{'config':<18}{'model':<18}{'compute':<10}{'load s':>8}{'MB':>7}{'decode s':>10}{'RTF':>7}")
+    for label, settings in configs:
+        variant = MODEL_VARIANTS.get(settings['model_name'], {'source': settings['model_name']})
+        key = (variant['source'], resolve_compute_type(settings['compute_type']),
+               (settings['cpu_threads'] or THREAD_BUDGET.whisper, settings['num_workers']))
+        pool = ModelPool(load_whisper_model, budget_mb=float('inf'))
+        try:
+            model = pool.acquire(key)
+        except Exception as e:
+            print(f"{label:<18}{settings['model_name']:<18}❌ {e}")
+            continue
+        decode_s, segments = best_time(lambda: list(model.transcribe(
+            audio, language='en', beam_size=settings['beam_size'], vad_filter=False)[0]), 1)
+        print(f"{label:<18}{settings['model_name']:<18}{key[1]:<10}{pool.load_times[key]:>8.1f}"
+              f"{pool.sizes_mb[key]:>7.0f}{decode_s:>10.2f}{decode_s / seconds:>7.3f}")
+        del model, segments
+        pool.clear()
+    return 0
+
+def benchmark_long_form(clip='', model='small', batch_size='8', seconds='180'):
+    """Real-time factor of a long recording: sequential vs batched chunk decoding"""
+    sample_rate, batch_size = 16000, int(batch_size)
+    audio = reference_clip(clip, sample_rate, float(seconds))
+    duration = len(audio) / sample_rate
+    # Fixed speech regions stand in for VAD output: a 0.5s pause every 6s
+    timestamps = [{'start': int(t * sample_rate), 'end': int((t + 5.5) * sample_rate)}
+                  for t in np.arange(0, duration, 6.0)]
+    regions = speech_regions(timestamps, len(audio), sample_rate)
+    chunks = long_form_chunks(regions, sample_rate)
+
+    variant = MODEL_VARIANTS.get(model, {'source': model})
+    settings = ACCURACY_MODES['clarity']
+    key = (variant['source'], resolve_compute_type(settings['compute_type']),
+           (THREAD_BUDGET.whisper, settings['num_workers']))
+    pool = ModelPool(load_whisper_model, budget_mb=float('inf'))
+    model = pool.acquire(key)
+    options = dict(language='en', beam_size=settings['beam_size'], vad_filter=False)
+
+    def sequential():
+        clip_timestamps = [t / sample_rate for region in regions for t in region]
+        return list(whisper_segments(model, audio, dict(
+            options, clip_timestamps=clip_timestamps, condition_on_previous_text=True)))
+
+    def batched():
+        clip_timestamps = [{'start': start / sample_rate, 'end': end / sample_rate} for start, end in chunks]
+        return list(whisper_segments(model, audio, dict(
+            options, clip_timestamps=clip_timestamps, batch_size=batch_size)))
+
+    print(f"{duration:.0f}s {'clip ' + clip if clip else 'of synthetic speech'}, {key[0]} {key[1]}, "
+          f"{key[2][0]} threads, {len(regions)} regions -> {len(chunks)} chunks\n")
+    print(f"{'path':<22}{'decode s':>10}{'RTF':>8}{'segments':>10}{'chars':>8}")
+    results = {}
+    for label, run in (('sequential', sequential), (f'batched (batch {batch_size})', batched)):
+        decode_s, segments = best_time(run, 1)
+        results[label] = decode_s
+        text = " ".join(segment.text.strip() for segment in segments)
+        print(f"{label:<22}{decode_s:>10.2f}{decode_s / duration:>8.3f}{len(segments):>10}{len(text):>8}")
+    sequential_s, batched_s = results.values()
+    print(f"\nBatched is {sequential_s / batched_s:.1f}x the sequential speed")
+    del model
+    pool.clear()
+    return 0
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance divided by the reference length (punctuation and case ignored)"""
+    ref = re.findall(r"[\w']+", reference.lower())
+    hyp = re.findall(r"[\w']+", hypothesis.lower())
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(len(ref), 1)
+
+def benchmark_prompts(clip='', reference='', budget='0', *modes):
+    """Prompt tokens, time to first segment, decode time and WER per prompt template and mode
+
+    reference is a text file with what the clip says (WER is skipped without it);
+    a budget of 0 keeps every prompt whole.
+    """
+    audio = reference_clip(clip)
+    seconds = len(audio) / 16000
+    expected = open(reference).read() if reference else None
+    budget = int(budget) or None
+    print(f"{seconds:.0f}s {'clip ' + clip if clip else 'of synthetic speech'}, "
+          f"prompt budget {f'{budget} tokens' if budget else 'none'}, best of 2\n")
+    print(f"{'mode':<9}{'template':<14}{'tokens':>7}{'first s':>9}{'decode s':>10}{'RTF':>7}{'WER':>7}")
+    for mode in modes or ACCURACY_MODES:
+        settings = ACCURACY_MODES[mode]
+        variant = MODEL_VARIANTS.get(settings['model_name'], {'source': settings['model_name']})
+        key = (variant['source'], resolve_compute_type(settings['compute_type']),
+               (settings['cpu_threads'] or THREAD_BUDGET.whisper, settings['num_workers']))
+        pool = ModelPool(load_whisper_model, budget_mb=float('inf'))
+        model = pool.acquire(key)
+        for name in PROMPT_TEMPLATES:
+            prompt = build_prompt(PROMPT_TEMPLATES, name, 'en', mode)
+            tokens = prompt_tokens(model, prompt, budget) if prompt else []
+            first = []
+
+            def run():
+                start = time.perf_counter()
+                segments = whisper_segments(model, audio, dict(
+                    language='en', beam_size=settings['beam_size'], temperature=settings['temperature'],
+                    vad_filter=False, initial_prompt=prompt or None, prompt_token_budget=budget))
+                texts = []
+                for segment in segments:
+                    if not texts:
+                        first.append(time.perf_counter() - start)
+                    texts.append(segment.text.strip())
+                return " ".join(texts)
+
+            decode_s, text = best_time(run, 2)
+            wer = f"{word_error_rate(expected, text):>7.1%}" if expected else f"{'-':>7}"
+            first_s = min(first) if first else float('nan')
+            print(f"{mode:<9}{name:<14}{len(tokens):>7}{first_s:>9.2f}{decode_s:>10.2f}"
+                  f"{decode_s / seconds:>7.3f}{wer}")
+        del model
+        pool.clear()
+    return 0
+
+def tuning_candidates():
+    """CPU thread counts and compute types worth timing on this machine"""
+    logical = os.cpu_count() or 1
+    physical = psutil.cpu_count(logical=False) or logical
+    threads = sorted({n for n in (2, 4, 8, 16, physical, logical) if n <= logical} or {logical})
+    # int8 family only: float32 doubles the memory for no accuracy gain here
+    compute_types = []
+    for compute_type in ('int8', 'int8_float16', 'int8_bfloat16', 'int16'):
+        resolved = resolve_compute_type(compute_type)
+        if resolved not in compute_types:
+            compute_types.append(resolved)
+    return threads, compute_types
+
+def tune_model(source, audio, repeats=2):
+    """Time transcription of audio over thread counts and compute types; returns the fastest"""
+    threads_options, compute_types = tuning_candidates()
+    seconds = len(audio) / 16000
+    results = []
+
+    def measure(compute_type, threads):
+        key = (source, compute_type, (threads, 1))
+        pool = ModelPool(load_whisper_model, budget_mb=float('inf'))
+        model = pool.acquire(key)
+        decode_s, _ = best_time(lambda: list(model.transcribe(
+            audio, language='en', beam_size=5, vad_filter=False)[0]), repeats)
+        del model
+        pool.clear()
+        results.append({'compute_type': compute_type, 'cpu_threads': threads, 'decode_s': round(decode_s, 3)})
+        print(f"   {compute_type:<14}{threads:>8}{decode_s:>11.2f}{decode_s / seconds:>8.3f}")
+
+    print(f"\n🔧 {source}: {seconds:.0f}s clip, best of {repeats}")
+    print(f"   {'compute':<14}{'threads':>8}{'decode s':>11}{'RTF':>8}")
+    # num_workers only helps concurrent transcriptions, which one dictation never has
+    for compute_type in compute_types:
+        for threads in threads_options:
+            measure(compute_type, threads)
+    return min(results, key=lambda result: result['decode_s'])
+
+def run_tuning(args):
+    """`--tune clip.wav [model ...]`: save the fastest settings per model in the config file"""
+    if not args or not args[0].lower().endswith('.wav'):
+        # Decode speed depends on what is decoded - synthetic tones would tune for the wrong thing
+        print("❌ Pass a WAV recording of your speech: --tune clip.wav [model ...]")
+        return 1
+    clip, models = args[0], args[1:]
+    config = {}
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as f:
+            config = json.load(f)
+    if not models:
+        # Every model the accuracy modes use, including config overrides
+        overrides = config.get('accuracy_modes', {})
+        models = []
+        for mode, settings in ACCURACY_MODES.items():
+            name = overrides.get(mode, {}).get('model_name', settings['model_name'])
+            if name not in models:
+                models.append(name)
+
+    audio = reference_clip(clip)
+    tuned = config.get('tuned_settings', {})
+    for name in models:
+        source = MODEL_VARIANTS.get(name, {'source': name})['source']
+        try:
+            best = tune_model(source, audio)
+        except Exception as e:
+            print(f"❌ Tuning {name} failed: {e}")
+            continue
+        best['tuned_at'] = time.strftime('%Y-%m-%d %H:%M')
+        tuned[source] = best
+        print(f"✅ {name}: {best['compute_type']}, {best['cpu_threads']} threads - {best['decode_s']:.2f}s")
+
+    # Re-read so nothing the app saved meanwhile is lost
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, 'r') as f:
+            config = json.load(f)
+    config['tuned_settings'] = tuned
+    with open(CONFIG_FILE, 'w') as f:
+        json.dump(config, f, indent=2)
+    print(f"\n💾 Saved to {CONFIG_FILE} - restart the app to use them")
+    return 0
+
+def benchmark_threads_run(runs='20', clip=''):
+    """One side of the thread benchmark: dictation latencies under this process's THREAD_BUDGET"""
+    runs = int(runs)
+    audio = reference_clip(clip, seconds=10)
+    print(f"Thread budget: {THREAD_BUDGET}")
+    model = load_whisper_model(('small', resolve_compute_type('int8'), (THREAD_BUDGET.whisper, 1)))
+    model_path = find_silero_onnx_model()
+    vad = SileroOnnxVAD(model_path, threads=THREAD_BUDGET.vad) if model_path else None
+    preprocessor = AudioPreprocessor(16000)
+    translation = None
+    try:
+        import argostranslate.translate
+        languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+        if 'en' in languages and 'es' in languages:
+            translation = languages['en'].get_translation(languages['es'])
+    except ImportError:
+        pass
+    if not translation:
+        print("⚠️  English→Spanish translation not installed - timing without it")
+
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        if vad:
+            vad.reset_states()
+            StreamingVAD(AudioCaptureBuffer(16000, data=audio), vad, threshold=0.5, gate=EnergyGate()).finish()
+        processed = preprocessor.process(audio.copy(), 'clarity', ACCURACY_MODES['clarity']['compression_ratio'])
+        segments, _ = model.transcribe(processed, language='en', beam_size=5, vad_filter=False)
+        text = " ".join(segment.text for segment in segments).strip()
+        if translation:
+            translation.translate(text or "This is a short dictation to translate into Spanish.")
+        latencies.append(time.perf_counter() - start)
+    print("LATENCIES " + json.dumps(latencies))
+    return 0
+
+def benchmark_threads(runs='20', clip='', budget=''):
+    """p50/p95 dictation latency with every library's own thread pools vs one shared budget"""
+    import subprocess
+    print(f"{runs} dictations (VAD, preprocessing, Whisper small, translation) per setup, "
+          f"{os.cpu_count()} cores\n")
+    print(f"{'setup':<60}{'p50 s':>8}{'p95 s':>8}")
+    for value in ('legacy', budget or str(os.cpu_count())):
+        # Each setup needs a fresh interpreter: BLAS sizes its pool when NumPy is imported
+        env = dict(os.environ, VOICE_TO_TEXT_THREAD_BUDGET=value)
+        for variable in ThreadBudget.BLAS_VARIABLES + ('ARGOS_INTER_THREADS', 'ARGOS_INTRA_THREADS'):
+            env.pop(variable, None)
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--benchmark', 'threads-run', runs, clip],
+            env=env, capture_output=True, text=True)
+        lines = result.stdout.splitlines()
+        latencies = next((json.loads(line[len("LATENCIES "):]) for line in lines
+                          if line.startswith("LATENCIES ")), None)
+        label = next((line[len("Thread budget: "):] for line in lines
+                      if line.startswith("Thread budget: ")), value)
+        if latencies is None:
+            print(f"{label:<60}❌ failed\n{result.stderr[-2000:]}")
+            return 1
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{label:<60}{p50:>8.2f}{p95:>8.2f}")
+    return 0
+
+BENCHMARKS = {
+    'preprocess': benchmark_preprocess,
+    'memory': benchmark_memory,
+    'streaming-preprocess': benchmark_streaming_preprocess,
+    'vad-gate': benchmark_vad_gate,
+    'streaming-replay': benchmark_streaming_replay,
+    'models': benchmark_models,
+    'long-form': benchmark_long_form,
+    'prompts': benchmark_prompts,
+    'threads': benchmark_threads,
+    'threads-run': benchmark_threads_run,
+}
+
+def run_benchmark(args):
+    """Dispatch `--benchmark <name> [args...]`"""
+    if not args or args[0] not in BENCHMARKS:
+        print(f"Usage: {os.path.basename(sys.argv[0])} --benchmark <{'|'.join(BENCHMARKS)}> [args...]")
+        return 2
+    return BENCHMARKS[args[0]](*args[1:])
+
 if __name__ == "__main__":
+    # Command-line tools run without starting the menu bar app
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        sys.exit(run_benchmark(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == '--tune':
+        sys.exit(run_tuning(sys.argv[2:]))
+
     # Check for single instance FIRST (before creating the app)
     check_single_instance()
 